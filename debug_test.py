@@ -1,57 +1,87 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
+import multiprocessing as mp
 sys.path.append('.')
 
-from src.image_processor import ImageProcessor
+from src.image_processor import ImageProcessor, VISION_BATCH_SIZE
 from src.config import initialize_apis
 from src.logging_utils import configure_logging, LogLevel
+from src.analysis_cache import DEFAULT_CACHE_DIR
+
+CREDENTIALS_PATH = 'config/service-account.json'
+PROJECT_ID = 'your-project-id'
+IMGS_DIR = './imgs'
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png'})
+GEMINI_CONCURRENCY = 4  # Appels Gemini simultanés par worker
+
+# Processeur propre à chaque worker (les clients API ne sont pas picklables)
+_processor = None
+# Erreur d'initialisation du worker, renvoyée au parent par la première tâche
+_init_error = None
+
+def _init_worker(credentials_path, project_id, cache_dir):
+    """Initialise les APIs et le processeur une seule fois par worker"""
+    global _processor, _init_error
+    configure_logging(console_level=LogLevel.DEBUG, file_level=LogLevel.DEBUG)
+    try:
+        vision_client, gemini_model = initialize_apis(credentials_path, project_id)
+        # Verbose level 3 to see all debug output including raw responses
+        _processor = ImageProcessor(vision_client, gemini_model, 'fr', verbose=3, max_workers=GEMINI_CONCURRENCY, cache_dir=cache_dir)
+    except Exception as e:
+        # Un initializer qui lève fait relancer le worker sans fin par Pool : on garde l'erreur
+        _init_error = e
+
+def _process_batch(image_paths):
+    """Traite un lot d'images (un seul appel Vision API) avec le processeur du worker courant"""
+    if _init_error is not None:
+        raise _init_error
+    return _processor.process_batch(image_paths)
+
+def main():
+    parser = argparse.ArgumentParser(description="Debug run of the image processor on ./imgs")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached analyses and call the APIs again")
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+
+    # Configure debug logging
+    configure_logging(console_level=LogLevel.DEBUG, file_level=LogLevel.DEBUG)
+
+    try:
+        # Single directory scan; a missing directory is reported by scandir itself
+        try:
+            with os.scandir(IMGS_DIR) as entries:
+                images = sorted(e.path for e in entries if e.is_file() and os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS)
+        except FileNotFoundError:
+            print("imgs directory not found")
+            return
+        if not images:
+            print("No images found in imgs directory")
+            return
+
+        # Group images by Vision batch size, then fan the batches out across worker processes
+        batches = [images[i:i + VISION_BATCH_SIZE] for i in range(0, len(images), VISION_BATCH_SIZE)]
+        workers = min(mp.cpu_count(), len(batches))
+        print(f"Processing {len(images)} images in {len(batches)} batches with {workers} workers...")
+        with mp.Pool(workers, initializer=_init_worker, initargs=(CREDENTIALS_PATH, PROJECT_ID, cache_dir)) as pool:
+            for batch_results in pool.imap_unordered(_process_batch, batches):
+                for result in batch_results:
+                    print(f"Result: {result}")
 
-# Configure debug logging
-configure_logging(console_level=LogLevel.DEBUG, file_level=LogLevel.DEBUG)
-
-try:
-    # Initialize APIs
-    vision_client, gemini_model = initialize_apis('config/service-account.json', 'your-project-id')
-    
-    # Create processor with verbose level 3 to see all debug output including raw responses
-    processor = ImageProcessor(vision_client, gemini_model, 'fr', True, 1, 'vision')
-    processor.verbose = 3
-    
-    # Test with one image
-    test_image = './imgs/Art.jpg'
-    if os.path.exists(test_image):
-        print(f"Processing {test_image}...")
-        result = processor.process_single_image(test_image)
-        print(f"Result: {result}")
-        
         # Debug output
         print(f"Processing completed successfully")
-    else:
-        print(f"Test image {test_image} not found")
-        # List available images
-        imgs_dir = './imgs'
-        if os.path.exists(imgs_dir):
-            images = [f for f in os.listdir(imgs_dir) if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-            if images:
-                test_image = os.path.join(imgs_dir, images[0])
-                print(f"Using first available image: {test_image}")
-                result = processor.process_single_image(test_image)
-                print(f"Result: {result}")
-                
-                # Debug output
-                print(f"Processing completed successfully")
-            else:
-                print("No images found in imgs directory")
-        else:
-            print("imgs directory not found")
-            
-except Exception as e:
-    print(f"Error: {e}")
-    import traceback
-    traceback.print_exc()
-    
-    # Write error details to file
-    with open('debug_output.txt', 'w', encoding='utf-8') as f:
-        f.write(f"Exception: {e}\n")
-        f.write(f"Traceback: {traceback.format_exc()}\n")
\ No newline at end of file
+
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        # Format the traceback once, reuse it for stderr and the debug file
+        tb = traceback.format_exc()
+        sys.stderr.write(tb)
+
+        # Write error details to file
+        with open('debug_output.txt', 'w', encoding='utf-8') as f:
+            f.write(f"Exception: {e}\nTraceback: {tb}\n")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import subprocess
 import os
 
+# Supported image extensions (lowercase)
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png'})
+
 def clear_and_write_metadata():
     """
     Clears specified metadata fields and writes 'Hylst' to other fields
@@ -25,48 +28,41 @@ def clear_and_write_metadata():
     ]
 
     # Get all JPG and PNG files in the current directory
-    image_files = [f for f in os.listdir('.') if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
+    image_files = [e.name for e in os.scandir('.') if e.is_file() and os.path.splitext(e.name)[1].lower() in IMAGE_EXTENSIONS]
 
     if not image_files:
         print("No JPG or PNG files found in the current directory.")
         return
 
-    for image_file in image_files:
-        print(f"Processing {image_file}...")
-        try:
-            # Construct the command to clear fields
-            clear_command = ["exiftool"]
-            for field in fields_to_clear:
-                clear_command.extend([f"-{field}="])
-            clear_command.append(image_file)
-            clear_command.append("-overwrite_original") # Overwrite original file, ExifTool creates a backup by default
-
-            # Execute the clear command
-            print(f"Clearing fields for {image_file}...")
-            subprocess.run(clear_command, check=True, capture_output=True, text=True)
-            print(f"Successfully cleared fields for {image_file}.")
-
-            # Construct the command to write 'Hylst' to fields
-            write_command = ["exiftool"]
-            for field in fields_to_write_hylst:
-                write_command.extend([f"-{field}=Hylst"])
-            write_command.append(image_file)
-            write_command.append("-overwrite_original") # Overwrite original file, ExifTool creates a backup by default
+    # Fields written with 'Hylst' are cleared implicitly by the new value,
+    # so only the remaining fields need an explicit empty assignment.
+    command = ["exiftool"]
+    for field in fields_to_clear:
+        if field not in fields_to_write_hylst:
+            command.append(f"-{field}=")
+    for field in fields_to_write_hylst:
+        command.append(f"-{field}=Hylst")
+    command.append("-overwrite_original") # Overwrite original file, ExifTool creates a backup by default
 
-            # Execute the write command
-            print(f"Writing 'Hylst' to fields for {image_file}...")
-            subprocess.run(write_command, check=True, capture_output=True, text=True)
-            print(f"Successfully wrote 'Hylst' to fields for {image_file}.")
+    # A single ExifTool process handles every file: the file list is piped
+    # through stdin ("-@ -"), so the interpreter starts only once.
+    command.extend(["-charset", "filename=utf8", "-@", "-"])
+    try:
+        print(f"Clearing fields and writing 'Hylst' for {len(image_files)} file(s): {', '.join(image_files)}...")
+        result = subprocess.run(command, input="\n".join(image_files) + "\n", check=True,
+                                capture_output=True, text=True, encoding="utf-8")
+        if result.stdout:
+            print(result.stdout.strip())
+        print(f"Successfully processed {len(image_files)} file(s).")
 
-        except FileNotFoundError:
-            print("Error: ExifTool not found. Please ensure ExifTool is installed and in your system's PATH.")
-            break
-        except subprocess.CalledProcessError as e:
-            print(f"Error processing {image_file}: {e}")
-            print(f"Stdout: {e.stdout}")
-            print(f"Stderr: {e.stderr}")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+    except FileNotFoundError:
+        print("Error: ExifTool not found. Please ensure ExifTool is installed and in your system's PATH.")
+    except subprocess.CalledProcessError as e:
+        print(f"Error processing files: {e}")
+        print(f"Stdout: {e.stdout}")
+        print(f"Stderr: {e.stderr}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
 
     print("Metadata operations completed.")
 
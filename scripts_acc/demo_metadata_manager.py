@@ -13,21 +13,104 @@ Date: 2024
 import os
 import sys
 import json
+import itertools
+import subprocess
 from pathlib import Path
 
+try:
+    import orjson  # Optionnel: parsing/sérialisation JSON beaucoup plus rapide
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optionnel: lecture en flux des premiers éléments d'un gros JSON
+except ImportError:
+    ijson = None
+
+# Chemins utilisés par la démonstration (calculés une seule fois)
+SCRIPT_DIR = Path(__file__).resolve().parent
+IMGS_DIR = SCRIPT_DIR.parent / "imgs"
+EXTRACT_JSON = SCRIPT_DIR / "extracted_metadata_demo.json"
+DEMO_JSON = SCRIPT_DIR / "demo_metadata.json"
+
 # Ajouter le répertoire parent au path pour importer metadata_manager
-sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(SCRIPT_DIR))
 
 from metadata_manager import MetadataManager
 
+def load_json(path):
+    """Charge un fichier JSON (orjson si disponible)"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_first_json_items(path, count):
+    """Charge uniquement les `count` premiers éléments d'une liste JSON
+    
+    Avec ijson, le fichier est lu en flux et le reste de la liste n'est jamais parsé.
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            return list(itertools.islice(ijson.items(f, 'item', use_float=True), count))
+    return load_json(path)[:count]
+
+def dump_json(data, path):
+    """Écrit un fichier JSON indenté en UTF-8 (orjson si disponible)"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def read_titles(image_paths):
+    """Lit le titre XMP de plusieurs images en un seul appel ExifTool
+    
+    Si ExifTool n'est pas disponible, les fichiers sont lus un par un avec pyexiv2.
+    
+    Returns:
+        Dictionnaire nom de fichier -> titre (None si absent, exception si erreur de lecture)
+    """
+    if not image_paths:
+        return {}
+    
+    try:
+        cmd = ['exiftool', '-charset', 'filename=utf8', '-j', '-XMP-dc:Title'] + [str(p) for p in image_paths]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding='utf-8')
+        entries = json.loads(result.stdout) if result.stdout.strip() else []
+        titles = {Path(entry['SourceFile']).name: entry.get('Title') for entry in entries}
+        for image_path in image_paths:
+            titles.setdefault(image_path.name, RuntimeError(result.stderr.strip() or "Lecture impossible"))
+        return titles
+    except FileNotFoundError:
+        pass  # ExifTool absent: lecture avec pyexiv2
+    
+    import pyexiv2
+    titles = {}
+    for image_path in image_paths:
+        try:
+            with pyexiv2.Image(str(image_path)) as img:
+                title = img.read_xmp().get('Xmp.dc.title', {})
+            if isinstance(title, dict):
+                titles[image_path.name] = title.get('lang="x-default"')
+            elif isinstance(title, str):
+                titles[image_path.name] = title
+            else:
+                titles[image_path.name] = None
+        except Exception as e:
+            titles[image_path.name] = e
+    return titles
+
 def demo_extract():
     """Démonstration de l'extraction de métadonnées"""
     print("🔍 Démonstration: Extraction de métadonnées")
     print("-" * 50)
     
     # Utiliser le répertoire imgs existant
-    imgs_dir = Path(__file__).parent.parent / "imgs"
-    output_file = Path(__file__).parent / "extracted_metadata_demo.json"
+    imgs_dir = IMGS_DIR
+    output_file = EXTRACT_JSON
     
     if not imgs_dir.exists():
         print(f"❌ Répertoire d'images non trouvé: {imgs_dir}")
@@ -41,8 +124,7 @@ def demo_extract():
         print(f"\n✅ Métadonnées extraites dans: {output_file}")
         
         # Afficher un aperçu du contenu
-        with open(output_file, 'r', encoding='utf-8') as f:
-            metadata_list = json.load(f)
+        metadata_list = load_json(output_file)
         
         print(f"\n📊 Résumé: {len(metadata_list)} images traitées")
         
@@ -70,7 +152,7 @@ def demo_apply():
     print("-" * 50)
     
     # Vérifier si le fichier d'extraction existe
-    metadata_file = Path(__file__).parent / "extracted_metadata_demo.json"
+    metadata_file = EXTRACT_JSON
     
     if not metadata_file.exists():
         print(f"❌ Fichier de métadonnées non trouvé: {metadata_file}")
@@ -78,15 +160,13 @@ def demo_apply():
         return False
     
     # Créer des métadonnées de test modifiées
-    with open(metadata_file, 'r', encoding='utf-8') as f:
-        original_metadata = json.load(f)
+    demo_metadata = load_first_json_items(metadata_file, 3)  # Prendre seulement 3 images
     
-    if not original_metadata:
+    if not demo_metadata:
         print("❌ Aucune métadonnée trouvée dans le fichier")
         return False
     
     # Modifier les métadonnées pour la démonstration
-    demo_metadata = original_metadata[:3]  # Prendre seulement 3 images
     
     for i, metadata in enumerate(demo_metadata):
         metadata['Titre'] = f"[DEMO] {metadata.get('Titre', 'Sans titre')} - Modifié"
@@ -98,9 +178,8 @@ def demo_apply():
         metadata['Conte'] = "Histoire créée pour la démonstration du gestionnaire de métadonnées."
     
     # Sauvegarder les métadonnées modifiées
-    demo_file = Path(__file__).parent / "demo_metadata.json"
-    with open(demo_file, 'w', encoding='utf-8') as f:
-        json.dump(demo_metadata, f, ensure_ascii=False, indent=2)
+    demo_file = DEMO_JSON
+    dump_json(demo_metadata, demo_file)
     
     print(f"📄 Métadonnées de démonstration créées: {demo_file}")
     print(f"📊 {len(demo_metadata)} images seront modifiées")
@@ -120,7 +199,7 @@ def demo_apply():
         return True
     
     # Appliquer les métadonnées
-    imgs_dir = Path(__file__).parent.parent / "imgs"
+    imgs_dir = IMGS_DIR
     manager = MetadataManager(verbose=True)
     success = manager.apply_metadata_from_json(str(demo_file), str(imgs_dir))
     
@@ -128,31 +207,20 @@ def demo_apply():
         print("\n✅ Métadonnées appliquées avec succès!")
         print("\n🔍 Vérification des modifications:")
         
-        # Vérifier quelques images
-        for metadata in demo_metadata[:2]:  # Vérifier 2 images
-            filename = metadata['Fichier']
-            image_path = imgs_dir / filename
-            
-            if image_path.exists():
-                try:
-                    import pyexiv2
-                    with pyexiv2.Image(str(image_path)) as img:
-                        xmp_data = img.read_xmp()
-                        title = xmp_data.get('Xmp.dc.title', {})
-                        
-                        if isinstance(title, dict) and 'lang="x-default"' in title:
-                            actual_title = title['lang="x-default"']
-                        elif isinstance(title, str):
-                            actual_title = title
-                        else:
-                            actual_title = "Titre non trouvé"
-                        
-                        print(f"  ✅ {filename}: {actual_title}")
-                        
-                except Exception as e:
-                    print(f"  ⚠️ {filename}: Erreur de vérification - {str(e)}")
-            else:
+        # Un seul parcours du répertoire plutôt qu'un stat() par image
+        existing_files = {e.name for e in os.scandir(imgs_dir) if e.is_file()}
+        
+        # Vérifier quelques images (lecture groupée des titres)
+        to_verify = [metadata['Fichier'] for metadata in demo_metadata[:2]]  # Vérifier 2 images
+        titles = read_titles([imgs_dir / filename for filename in to_verify if filename in existing_files])
+        
+        for filename in to_verify:
+            if filename not in existing_files:
                 print(f"  ❌ {filename}: Fichier non trouvé")
+            elif isinstance(titles.get(filename), Exception):
+                print(f"  ⚠️ {filename}: Erreur de vérification - {str(titles[filename])}")
+            else:
+                print(f"  ✅ {filename}: {titles.get(filename) or 'Titre non trouvé'}")
         
         return True
     else:
@@ -212,7 +280,7 @@ def main():
     ]
     
     for filename in files_created:
-        filepath = Path(__file__).parent / filename
+        filepath = SCRIPT_DIR / filename
         if filepath.exists():
             print(f"  ✅ {filename} ({filepath.stat().st_size} bytes)")
         else:
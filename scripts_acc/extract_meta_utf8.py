@@ -31,11 +31,207 @@ Gestion des erreurs:
   - Gère les erreurs d'exécution d'ExifTool.
 """
 import os
+import re
 import json
 import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
-# Extensions d'image supportées par le script
-EXTENSIONS = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.webp'}
+try:
+    import orjson  # Optionnel: parsing/sérialisation JSON beaucoup plus rapide
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optionnel: lecture en flux de la sortie JSON d'ExifTool
+except ImportError:
+    ijson = None
+
+# Erreurs de décodage possibles selon le parseur utilisé
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson is not None else (json.JSONDecodeError,)
+
+# Table de correspondance de l'export JSON : (nom exporté, champ ExifTool, valeur par défaut)
+# CORRECTION: Les noms des champs doivent correspondre exactement aux noms retournés par ExifTool
+# Les valeurs par défaut des listes sont des tuples (partagés entre enregistrements, donc immuables)
+EXPORT_FIELDS = (
+    ("Fichier", "SourceFile", ""),  # Nom du fichier source
+    ("Taille", "FileSize", ""),  # Taille du fichier
+    ("Type", "MIMEType", ""),  # Type MIME de l'image
+    ("Largeur", "ExifImageWidth", ""),  # Largeur de l'image en pixels
+    ("Hauteur", "ExifImageHeight", ""),  # Hauteur de l'image en pixels
+    ("Categorie", "Category", ""),  # Catégorie IPTC
+    ("Categorie secondaire", "SupplementalCategories", ""),  # Catégories supplémentaires IPTC
+    ("Createur", "Artist", ""),  # Créateur (Artist field)
+    ("Description", "Description", ""),  # Description XMP/IPTC
+    ("Mots cles", "Subject", ()),  # Mots-clés XMP (peut être une liste)
+    ("Titre", "Title", ""),  # Titre XMP
+    ("Caracteristiques", "Keywords", ()),  # Mots-clés IPTC (liste)
+    ("Perception", "Instructions", ""),  # Instructions IPTC
+    ("Conte", "Caption-Abstract", ""),  # Légende/Résumé IPTC
+)
+
+# Balises de EXPORT_FIELDS connues sans interroger ExifTool
+LOCAL_TAGS = frozenset({"SourceFile", "FileSize"})
+
+# Cache des enregistrements d'export, invalidé par fichier quand sa taille ou son mtime change
+META_CACHE_FILE = ".meta_cache.json"
+META_CACHE_VERSION = 1
+
+# Extensions d'image supportées par le script (sans le point, comparées au suffixe du nom)
+EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'tif', 'tiff', 'webp'})
+
+# Sous-ensemble des extensions modifiées par les opérations d'écriture en lot
+WRITABLE_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png'})
+
+# Dernier listage du répertoire courant, invalidé quand son mtime change
+_FILE_CACHE = {'mtime': None, 'files': None}
+
+def parse_json(data):
+    """Décode la sortie JSON d'ExifTool (bytes ou str), avec orjson si disponible."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def stderr_text(stderr):
+    """Retourne la sortie d'erreur d'ExifTool sous forme de texte lisible."""
+    if isinstance(stderr, bytes):
+        return stderr.decode("utf-8", errors="replace")
+    return stderr
+
+class PersistentExifTool:
+    """
+    Processus ExifTool unique maintenu ouvert (mode -stay_open) pour enchaîner
+    les commandes sans relancer l'interpréteur Perl à chaque fichier.
+    
+    Chaque commande est envoyée comme un bloc d'arguments terminé par -execute ;
+    ExifTool signale la fin de son traitement par la ligne {ready} sur stdout
+    (et sur stderr grâce à -echo4).
+    
+    Les échanges se font en octets : la sortie JSON est passée telle quelle à parse_json,
+    sans décodage intermédiaire ; seul le texte affiché est décodé.
+    """
+    READY = b"{ready}"
+    
+    def __enter__(self):
+        # Lève FileNotFoundError si ExifTool n'est pas installé, comme subprocess.run
+        self.process = subprocess.Popen(
+            ['exiftool', '-stay_open', 'True', '-@', '-'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.process.stdin.write(b"-stay_open\nFalse\n")
+            self.process.stdin.flush()
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+    
+    def _read_until_ready(self, stream):
+        """Lit un flux jusqu'au marqueur {ready} et retourne les octets qui le précèdent."""
+        lines = []
+        while True:
+            line = stream.readline()
+            if not line:
+                raise subprocess.CalledProcessError(self.process.poll() or 1, 'exiftool', b"".join(lines))
+            if line.rstrip() == self.READY:
+                return b"".join(lines)
+            lines.append(line)
+    
+    def execute(self, *args):
+        """
+        Exécute une commande ExifTool dans le processus persistant.
+        
+        Args:
+            *args: Arguments de la commande (un par ligne dans le fichier d'arguments)
+            
+        Returns:
+            bytes: Sortie standard de la commande (UTF-8)
+            
+        Raises:
+            subprocess.CalledProcessError: Si ExifTool signale une erreur (stderr décodé en texte)
+        """
+        block = "\n".join(args + ('-echo4', self.READY.decode(), '-execute')) + "\n"
+        self.process.stdin.write(block.encode("utf-8"))
+        self.process.stdin.flush()
+        
+        stdout = self._read_until_ready(self.process.stdout)
+        stderr = stderr_text(self._read_until_ready(self.process.stderr))
+        if any(line.startswith("Error") for line in stderr.splitlines()):
+            raise subprocess.CalledProcessError(1, ['exiftool'] + list(args), stdout, stderr)
+        return stdout
+
+# Processus ExifTool persistant partagé par les actions du menu (démarré à la première utilisation)
+_session_exiftool = None
+
+def run_exiftool(cmd):
+    """
+    Exécute une commande ExifTool de lecture dans le processus de la session.
+    
+    Args:
+        cmd (list): Commande complète, commençant par 'exiftool'
+        
+    Returns:
+        bytes: Sortie standard de la commande (UTF-8), à passer à parse_json ou à décoder
+        
+    Raises:
+        FileNotFoundError: Si ExifTool n'est pas installé
+        subprocess.CalledProcessError: Si ExifTool signale une erreur
+    """
+    global _session_exiftool
+    # (re)démarre le processus s'il n'existe pas encore ou s'est arrêté
+    if _session_exiftool is None or _session_exiftool.process.poll() is not None:
+        _session_exiftool = PersistentExifTool().__enter__()
+    return _session_exiftool.execute(*cmd[1:])
+
+def close_exiftool_session():
+    """Arrête le processus ExifTool de la session s'il a été démarré."""
+    global _session_exiftool
+    if _session_exiftool is not None:
+        _session_exiftool.__exit__(None, None, None)
+        _session_exiftool = None
+
+def run_batch_update(tag_args):
+    """
+    Applique les mêmes opérations d'écriture à tous les fichiers JPG et PNG du répertoire
+    courant, en un seul appel ExifTool.
+    
+    Toute la tâche (champs à écrire, options, puis un fichier par ligne) est décrite dans
+    un fichier d'arguments transmis sur l'entrée standard (-@ -) : pas de fichier temporaire
+    et aucune limite de longueur de ligne de commande.
+    
+    Args:
+        tag_args (list): Arguments d'écriture ExifTool (ex: ["-Artist=..."])
+    """
+    # Récupère uniquement les fichiers JPG et PNG
+    files = [f for f in get_image_files() if f.rpartition('.')[2].lower() in WRITABLE_EXTENSIONS]
+    
+    if not files:
+        print("❌ Aucun fichier JPG ou PNG détecté dans le répertoire courant.")
+        return
+    
+    print(f"📁 {len(files)} fichier(s) à traiter: {', '.join(files)}")
+    
+    # -charset reste sur la ligne de commande pour s'appliquer avant la lecture des noms de fichiers
+    command = ["exiftool", "-charset", "filename=utf8", "-@", "-"]
+    argfile = "\n".join(tag_args + ["-overwrite_original"] + files) + "\n"
+    try:
+        # Pas de check=True : ExifTool traite tous les fichiers même si certains échouent
+        result = subprocess.run(command, input=argfile, capture_output=True, text=True, encoding="utf-8")
+    except FileNotFoundError:
+        print("❌ Erreur : ExifTool non trouvé. Veuillez vous assurer qu'ExifTool est installé et dans votre PATH système.")
+        return
+    
+    # Résumé d'ExifTool, ex: "3 image files updated", "1 files weren't updated due to errors"
+    summary = [line.strip() for line in result.stdout.splitlines()
+               if re.match(r"\s*\d+ .*(updated|unchanged)", line)]
+    for line in summary:
+        print(f"📊 {line}")
+    if result.stderr:
+        print(f"❌ Erreur: {result.stderr}")
 
 def get_image_files():
     """
@@ -44,10 +240,19 @@ def get_image_files():
     Returns:
         list: Liste des noms de fichiers image trouvés
     """
-    # os.listdir('.') liste tous les fichiers et dossiers dans le répertoire actuel.
-    # os.path.splitext(f) divise le nom de fichier en nom de base et extension.
-    # [1].lower() prend l'extension et la convertit en minuscules pour une comparaison insensible à la casse.
-    return [f for f in os.listdir('.') if os.path.splitext(f)[1].lower() in EXTENSIONS]
+    # Le mtime du répertoire change dès qu'un fichier y est ajouté, supprimé ou renommé :
+    # tant qu'il est identique, le listage précédent reste valable.
+    mtime = os.stat('.').st_mtime_ns
+    if _FILE_CACHE['mtime'] != mtime:
+        # os.scandir('.') fournit le type de chaque entrée sans appel stat supplémentaire.
+        # rpartition('.') isole l'extension sans construire le tuple de os.path.splitext.
+        with os.scandir('.') as entries:
+            _FILE_CACHE['files'] = [
+                e.name for e in entries
+                if e.is_file() and '.' in e.name and e.name.rpartition('.')[2].lower() in EXTENSIONS
+            ]
+        _FILE_CACHE['mtime'] = mtime
+    return list(_FILE_CACHE['files'])
 
 def debug_metadata_fields():
     """
@@ -74,8 +279,7 @@ def debug_metadata_fields():
     ]
     
     try:
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding="utf-8", check=True)
-        raw_json = json.loads(result.stdout)
+        raw_json = parse_json(run_exiftool(cmd))
         
         if raw_json:
             print("\nTous les champs disponibles :")
@@ -87,6 +291,163 @@ def debug_metadata_fields():
     except Exception as e:
         print(f"Erreur lors du débogage : {e}")
 
+def to_export_record(item):
+    """
+    Convertit un enregistrement ExifTool au format d'export personnalisé.
+    
+    Args:
+        item (dict): Métadonnées d'un fichier telles que retournées par ExifTool (-j)
+        
+    Returns:
+        dict: Enregistrement avec les noms de champs en français
+    """
+    return {export_name: item.get(exiftool_name, default) for export_name, exiftool_name, default in EXPORT_FIELDS}
+
+def _dump_record(record):
+    """Sérialise un enregistrement indenté de 2 espaces, en bytes UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, ensure_ascii=False, indent=2).encode("utf-8")
+
+def write_export(records, output_path):
+    """
+    Écrit les enregistrements d'export un par un dans un tableau JSON.
+    
+    Le résultat est identique à json.dump(indent=2, ensure_ascii=False), sans jamais
+    construire la liste complète ni sa sérialisation en mémoire.
+    
+    Args:
+        records (iterable): Enregistrements produits par to_export_record
+        output_path (str): Fichier JSON à créer
+    """
+    with open(output_path, "wb") as f:
+        f.write(b"[")
+        separator = b"\n  "
+        for record in records:
+            # Chaque enregistrement est décalé d'un niveau dans le tableau
+            f.write(separator + _dump_record(record).replace(b"\n", b"\n  "))
+            separator = b",\n  "
+        f.write(b"]" if separator == b"\n  " else b"\n]")
+
+def anonymous_file():
+    """
+    Ouvre un fichier anonyme en lecture/écriture binaire, utilisable comme sortie d'un processus.
+    
+    Sous Linux, memfd_create le garde en mémoire ; ailleurs, c'est un fichier temporaire
+    supprimé à la fermeture.
+    """
+    if hasattr(os, "memfd_create"):
+        return open(os.memfd_create("exiftool-output"), "w+b")
+    return tempfile.TemporaryFile()
+
+def iter_exiftool_json(cmd):
+    """
+    Exécute ExifTool (-j) et produit ses enregistrements un par un.
+    
+    Avec ijson, la sortie est analysée en flux : ni la sortie brute ni la liste complète
+    ne sont gardées en mémoire. Sans ijson, la sortie est chargée d'un bloc.
+    
+    Args:
+        cmd (list): Commande ExifTool produisant un tableau JSON (-j)
+        
+    Yields:
+        dict: Métadonnées d'un fichier
+        
+    Raises:
+        FileNotFoundError: Si ExifTool n'est pas installé
+        subprocess.CalledProcessError: Si ExifTool retourne un code d'erreur
+        JSON_ERRORS: Si la sortie d'ExifTool n'est pas un JSON valide
+    """
+    if ijson is None:
+        # ExifTool écrit directement dans un fichier anonyme plutôt que dans un tube :
+        # pas de va-et-vient par le petit tampon du noyau, une seule lecture à la fin
+        with anonymous_file() as output:
+            subprocess.run(cmd, stdout=output, stderr=subprocess.PIPE, check=True)
+            output.seek(0)
+            data = output.read()
+        yield from parse_json(data)
+        return
+    
+    # stderr part dans un fichier anonyme : un tube non lu pourrait bloquer ExifTool
+    with anonymous_file() as stderr_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        try:
+            yield from ijson.items(process.stdout, 'item', use_float=True)
+        except BaseException as e:
+            # Fermer le tube débloque ExifTool s'il écrivait encore ; sur une erreur de
+            # parsing, on le laisse se terminer pour connaître son code de retour
+            process.stdout.close()
+            if not isinstance(e, JSON_ERRORS):
+                process.kill()
+            process.wait()
+            # Une sortie tronquée vient d'un échec d'ExifTool : remonter son erreur plutôt que celle du parseur
+            if isinstance(e, JSON_ERRORS) and process.returncode > 0:
+                stderr_file.seek(0)
+                raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr_file.read()) from e
+            raise
+        finally:
+            process.stdout.close()
+        
+        if process.wait() != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr_file.read())
+
+def format_file_size(size):
+    """
+    Formate une taille en octets comme la balise FileSize d'ExifTool (unités décimales).
+    
+    Args:
+        size (int): Taille en octets
+        
+    Returns:
+        str: Taille lisible, ex: "850 bytes", "3.2 kB", "245 kB", "1.5 MB"
+    """
+    if size < 2000:
+        return f"{size} bytes"
+    for unit, factor in (("kB", 1e3), ("MB", 1e6), ("GB", 1e9)):
+        if size < 10 * factor:
+            return f"{size / factor:.1f} {unit}"
+        if size < 2000 * factor or unit == "GB":
+            return f"{size / factor:.0f} {unit}"
+
+def file_signature(path):
+    """Retourne (taille, mtime en ns) d'un fichier, qui change dès que son contenu est modifié."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def load_meta_cache():
+    """
+    Charge le cache des enregistrements d'export du répertoire courant.
+    
+    Returns:
+        dict: Nom de fichier -> {"signature": [taille, mtime_ns], "record": enregistrement}
+    """
+    try:
+        with open(META_CACHE_FILE, "rb") as f:
+            cache = parse_json(f.read())
+    except (OSError, *JSON_ERRORS):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != META_CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+def save_meta_cache(entries):
+    """
+    Enregistre le cache de façon atomique (fichier temporaire puis renommage).
+    
+    Args:
+        entries (dict): Nom de fichier -> {"signature": ..., "record": ...}
+    """
+    temp_path = META_CACHE_FILE + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_dump_record({"version": META_CACHE_VERSION, "files": entries}))
+        os.replace(temp_path, META_CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️ Impossible d'écrire le cache {META_CACHE_FILE}: {e}")
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
 def extract_metadata():
     """
     Extrait les métadonnées des fichiers image et les exporte vers un fichier JSON.
@@ -109,68 +470,45 @@ def extract_metadata():
     # Construit la commande ExifTool avec les options et les champs à extraire.
     # '-charset filename=utf8' et '-charset exiftool=utf8' assurent la gestion correcte de l'UTF-8.
     # '-j' spécifie la sortie au format JSON.
-    # Les champs listés sont ceux qui seront extraits des métadonnées des images.
-    # CORRECTION: Utilisation des noms de champs corrects basés sur l'analyse ExifTool
+    # '-fast2' évite de lire les MakerNotes et le reste du fichier après les en-têtes.
+    # Les champs demandés sont ceux de EXPORT_FIELDS : ExifTool n'extrait que les balises
+    # nommées sur la ligne de commande. SourceFile est toujours fourni et FileSize vient
+    # du stat déjà fait pour le cache.
     cmd = [
         'exiftool',
         '-charset', 'filename=utf8',
         '-charset', 'exiftool=utf8',
         '-j',
-        '-FileName',
-        '-FileSize',
-        '-MIMEType',
-        '-ExifImageWidth',
-        '-ExifImageHeight',
-        '-Category',  # IPTC Category
-        '-SupplementalCategories',  # IPTC SupplementalCategories
-        '-Artist',  # IFD0 Artist
-        '-Description',  # XMP-dc Description
-        '-Subject',  # XMP-dc Subject
-        '-Title',  # XMP-dc Title
-        '-Keywords',  # IPTC Keywords
-        '-Instructions',  # XMP-photoshop Instructions
-        '-Caption-Abstract'  # IPTC Caption-Abstract
-    ] + files # Ajoute les noms des fichiers image à la commande
+        '-fast2',
+    ] + [f"-{tag}" for _, tag, _ in EXPORT_FIELDS if tag not in LOCAL_TAGS]
     
     # Exécution de la commande ExifTool
     try:
-        # subprocess.run exécute la commande externe.
-        # stdout=subprocess.PIPE capture la sortie standard.
-        # stderr=subprocess.PIPE capture la sortie d'erreur.
-        # encoding="utf-8" spécifie l'encodage pour la sortie.
-        # check=True lève une CalledProcessError si la commande retourne un code d'erreur non nul.
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, encoding="utf-8", check=True)
-        # Charge la sortie JSON brute d'ExifTool.
-        raw_json = json.loads(result.stdout)
+        # Seuls les fichiers nouveaux ou modifiés depuis le dernier export passent par ExifTool
+        cache = load_meta_cache()
+        signatures = {f: file_signature(f) for f in files}
+        stale = [f for f in files if cache.get(f, {}).get("signature") != signatures[f]]
+        print(f"🔄 {len(stale)} fichier(s) à analyser, {len(files) - len(stale)} repris du cache")
         
-        # Traite les données JSON brutes pour créer un format personnalisé.
-        # CORRECTION: Les noms des champs doivent correspondre exactement aux noms retournés par ExifTool
-        custom_json = []
-        for item in raw_json:
-            custom_json.append({
-                "Fichier": item.get("SourceFile", ""), # Nom du fichier source
-                "Taille": item.get("FileSize", ""), # Taille du fichier
-                "Type": item.get("MIMEType", ""), # Type MIME de l'image
-                "Largeur": item.get("ExifImageWidth", ""), # Largeur de l'image en pixels
-                "Hauteur": item.get("ExifImageHeight", ""), # Hauteur de l'image en pixels
-                # CORRECTION: Utilisation des noms exacts retournés par ExifTool
-                "Categorie": item.get("Category", ""), # Catégorie IPTC
-                "Categorie secondaire": item.get("SupplementalCategories", ""), # Catégories supplémentaires IPTC
-                "Createur": item.get("Artist", ""), # Créateur (Artist field)
-                "Description": item.get("Description", ""), # Description XMP/IPTC
-                "Mots cles": item.get("Subject", []), # Mots-clés XMP (peut être une liste)
-                "Titre": item.get("Title", ""), # Titre XMP
-                "Caracteristiques": item.get("Keywords", []), # Mots-clés IPTC (liste)
-                "Perception": item.get("Instructions", ""), # Instructions IPTC
-                "Conte": item.get("Caption-Abstract", "") # Légende/Résumé IPTC
-            })
+        if stale:
+            # Ajoute les noms des fichiers image à la commande.
+            # Sans encoding, la sortie reste en bytes UTF-8 et part directement au parseur JSON.
+            # Une CalledProcessError est levée si la commande retourne un code d'erreur non nul.
+            for item in iter_exiftool_json(cmd + stale):
+                # Traite les données JSON brutes pour créer un format personnalisé.
+                source = item.get("SourceFile", "")
+                if source in signatures:
+                    item["FileSize"] = format_file_size(signatures[source][0])
+                    cache[source] = {"signature": signatures[source], "record": to_export_record(item)}
         
-        # Écrit les données JSON personnalisées dans un fichier.
-        # "w" pour l'écriture, encoding="utf-8" pour supporter les caractères spéciaux.
-        # ensure_ascii=False permet d'écrire des caractères non-ASCII directement.
-        # indent=2 formate le JSON avec une indentation de 2 espaces pour la lisibilité.
-        with open("export_meta_utf8.json", "w", encoding="utf-8") as f:
-            json.dump(custom_json, f, ensure_ascii=False, indent=2)
+        # Ordre d'origine des fichiers ; les fichiers disparus sont retirés du cache
+        cached_count = len(cache)
+        cache = {f: cache[f] for f in files if f in cache}
+        if stale or len(cache) != cached_count:
+            save_meta_cache(cache)
+        
+        # Écrit les données JSON personnalisées dans un fichier, enregistrement par enregistrement
+        write_export((entry["record"] for entry in cache.values()), "export_meta_utf8.json")
         print("✅ export_meta_utf8.json créé avec succès.")
         
     # Gestion des erreurs spécifiques
@@ -178,8 +516,8 @@ def extract_metadata():
         print("❌ Erreur : exiftool n'est pas installé ou n'est pas dans le PATH. Veuillez l'installer et vérifier votre configuration.")
     except subprocess.CalledProcessError as e:
         # Affiche l'erreur standard d'ExifTool si la commande échoue.
-        print(f"❌ Erreur d'exécution ExifTool :\n{e.stderr}")
-    except json.JSONDecodeError:
+        print(f"❌ Erreur d'exécution ExifTool :\n{stderr_text(e.stderr)}")
+    except JSON_ERRORS:
         # Gère les erreurs si la sortie d'ExifTool n'est pas un JSON valide.
         print("❌ Erreur : La sortie d'ExifTool n'est pas un JSON valide. Il peut y avoir un problème avec les métadonnées ou la commande.")
     except Exception as e:
@@ -195,15 +533,6 @@ def clear_metadata_batch():
     """
     print("\n🧹 Nettoyage des métadonnées en cours...")
     
-    # Récupère uniquement les fichiers JPG et PNG
-    files = [f for f in os.listdir('.') if os.path.splitext(f)[1].lower() in {'.jpg', '.jpeg', '.png'}]
-    
-    if not files:
-        print("❌ Aucun fichier JPG ou PNG détecté dans le répertoire courant.")
-        return
-    
-    print(f"📁 {len(files)} fichier(s) à traiter: {', '.join(files)}")
-    
     # Champs à effacer
     fields_to_clear = [
         "Creator",
@@ -214,31 +543,8 @@ def clear_metadata_batch():
         "Software"
     ]
     
-    for image_file in files:
-        print(f"🔄 Traitement de {image_file}...")
-        try:
-            # Construit la commande pour effacer les champs
-            clear_command = ["exiftool"]
-            for field in fields_to_clear:
-                clear_command.extend([f"-{field}="])
-            clear_command.append(image_file)
-            clear_command.append("-overwrite_original")  # Écrase le fichier original, ExifTool crée une sauvegarde par défaut
-            
-            # Exécute la commande de nettoyage
-            subprocess.run(clear_command, check=True, capture_output=True, text=True)
-            print(f"✅ Métadonnées effacées pour {image_file}")
-            
-        except FileNotFoundError:
-            print("❌ Erreur : ExifTool non trouvé. Veuillez vous assurer qu'ExifTool est installé et dans votre PATH système.")
-            break
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Erreur lors du traitement de {image_file}: {e}")
-            if e.stdout:
-                print(f"Sortie: {e.stdout}")
-            if e.stderr:
-                print(f"Erreur: {e.stderr}")
-        except Exception as e:
-            print(f"❌ Une erreur inattendue s'est produite: {e}")
+    # Un seul appel ExifTool pour effacer les champs de tous les fichiers
+    run_batch_update([f"-{field}=" for field in fields_to_clear])
     
     print("🏁 Nettoyage des métadonnées terminé.")
 
@@ -251,15 +557,6 @@ def write_author_metadata():
     """
     print("\n✍️ Écriture des informations d'auteur en cours...")
     
-    # Récupère uniquement les fichiers JPG et PNG
-    files = [f for f in os.listdir('.') if os.path.splitext(f)[1].lower() in {'.jpg', '.jpeg', '.png'}]
-    
-    if not files:
-        print("❌ Aucun fichier JPG ou PNG détecté dans le répertoire courant.")
-        return
-    
-    print(f"📁 {len(files)} fichier(s) à traiter: {', '.join(files)}")
-    
     # Valeur à écrire
     author_value = "Geoffroy Streit / Hylst"
     
@@ -269,31 +566,8 @@ def write_author_metadata():
         "XPAuthor"
     ]
     
-    for image_file in files:
-        print(f"🔄 Traitement de {image_file}...")
-        try:
-            # Construit la commande pour écrire les champs
-            write_command = ["exiftool"]
-            for field in fields_to_write:
-                write_command.extend([f"-{field}={author_value}"])
-            write_command.append(image_file)
-            write_command.append("-overwrite_original")  # Écrase le fichier original, ExifTool crée une sauvegarde par défaut
-            
-            # Exécute la commande d'écriture
-            subprocess.run(write_command, check=True, capture_output=True, text=True)
-            print(f"✅ Informations d'auteur écrites pour {image_file}")
-            
-        except FileNotFoundError:
-            print("❌ Erreur : ExifTool non trouvé. Veuillez vous assurer qu'ExifTool est installé et dans votre PATH système.")
-            break
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Erreur lors du traitement de {image_file}: {e}")
-            if e.stdout:
-                print(f"Sortie: {e.stdout}")
-            if e.stderr:
-                print(f"Erreur: {e.stderr}")
-        except Exception as e:
-            print(f"❌ Une erreur inattendue s'est produite: {e}")
+    # Un seul appel ExifTool pour écrire les champs de tous les fichiers
+    run_batch_update([f"-{field}={author_value}" for field in fields_to_write])
     
     print("🏁 Écriture des informations d'auteur terminée.")
 
@@ -334,13 +608,12 @@ def view_all_metadata():
                 selected_file
             ]
             
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                  encoding="utf-8", check=True)
+            output = run_exiftool(cmd).decode("utf-8", errors="replace")
             
             print("\n" + "="*80)
             print(f"📋 MÉTADONNÉES COMPLÈTES - {selected_file}")
             print("="*80)
-            print(result.stdout)
+            print(output)
             print("="*80)
             
         else:
@@ -390,15 +663,12 @@ def view_useful_metadata():
                 'Orientation', 'XResolution', 'YResolution', 'Software'
             ]
             
-            cmd = ['exiftool', '-charset', 'filename=utf8', '-charset', 'exiftool=utf8', '-j']
+            cmd = ['exiftool', '-charset', 'filename=utf8', '-charset', 'exiftool=utf8', '-j', '-fast2']
             for field in useful_fields:
                 cmd.append(f'-{field}')
             cmd.append(selected_file)
             
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                  encoding="utf-8", check=True)
-            
-            data = json.loads(result.stdout)[0]
+            data = parse_json(run_exiftool(cmd))[0]
             
             print("\n" + "="*80)
             print(f"📋 MÉTADONNÉES UTILES - {selected_file}")
@@ -458,12 +728,30 @@ def view_useful_metadata():
     except FileNotFoundError:
         print("❌ ExifTool non trouvé. Veuillez l'installer.")
     except subprocess.CalledProcessError as e:
-        print(f"❌ Erreur ExifTool: {e.stderr}")
+        print(f"❌ Erreur ExifTool: {stderr_text(e.stderr)}")
     except json.JSONDecodeError:
         print("❌ Erreur de décodage JSON.")
     except Exception as e:
         print(f"❌ Erreur inattendue: {e}")
 
+def _hashable(value):
+    """Rend hachable une valeur ExifTool (les listes deviennent des tuples)."""
+    return tuple(value) if isinstance(value, list) else value
+
+def _different_keys(data1, data2, common_keys):
+    """
+    Retourne, triés, les champs communs dont la valeur diffère entre deux fichiers.
+    
+    La différence symétrique des ensembles (clé, valeur) est calculée en C ; on revient
+    à une comparaison clé par clé si une valeur reste non hachable.
+    """
+    try:
+        changed = {key for key, _ in {(k, _hashable(v)) for k, v in data1.items()}
+                                     ^ {(k, _hashable(v)) for k, v in data2.items()}}
+    except TypeError:
+        return sorted(key for key in common_keys if data1[key] != data2[key])
+    return sorted(changed & common_keys)
+
 def compare_metadata():
     """
     Compare les métadonnées entre deux fichiers image.
@@ -491,20 +779,16 @@ def compare_metadata():
             file1, file2 = files[choice1], files[choice2]
             print(f"\n🔍 Comparaison entre {file1} et {file2}...")
             
-            # Extraction des métadonnées pour les deux fichiers
-            cmd_base = ['exiftool', '-charset', 'filename=utf8', '-charset', 'exiftool=utf8', '-j']
-            
-            result1 = subprocess.run(cmd_base + [file1], stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, encoding="utf-8", check=True)
-            result2 = subprocess.run(cmd_base + [file2], stdout=subprocess.PIPE, 
-                                   stderr=subprocess.PIPE, encoding="utf-8", check=True)
+            # Extraction de toutes les métadonnées des deux fichiers
+            # ('-fast' et non '-fast2' : les différences dans les MakerNotes doivent apparaître)
+            cmd_base = ['exiftool', '-charset', 'filename=utf8', '-charset', 'exiftool=utf8', '-j', '-fast']
             
-            data1 = json.loads(result1.stdout)[0]
-            data2 = json.loads(result2.stdout)[0]
+            # Un seul appel ExifTool : les enregistrements suivent l'ordre des fichiers passés
+            data1, data2 = parse_json(run_exiftool(cmd_base + [file1, file2]))
             
-            # Comparaison
-            all_keys = set(data1.keys()) | set(data2.keys())
-            common_keys = set(data1.keys()) & set(data2.keys())
+            # Comparaison (opérations ensemblistes directement sur les vues de clés)
+            keys1, keys2 = data1.keys(), data2.keys()
+            common_keys = keys1 & keys2
             
             print("\n" + "="*100)
             print(f"📊 COMPARAISON DE MÉTADONNÉES")
@@ -512,18 +796,16 @@ def compare_metadata():
             print(f"Fichier 1: {file1}")
             print(f"Fichier 2: {file2}")
             print(f"\nChamps communs: {len(common_keys)}")
-            print(f"Champs uniques au fichier 1: {len(set(data1.keys()) - set(data2.keys()))}")
-            print(f"Champs uniques au fichier 2: {len(set(data2.keys()) - set(data1.keys()))}")
+            print(f"Champs uniques au fichier 1: {len(keys1 - keys2)}")
+            print(f"Champs uniques au fichier 2: {len(keys2 - keys1)}")
             
             print("\n🔍 DIFFÉRENCES DÉTECTÉES:")
-            differences_found = False
-            for key in sorted(common_keys):
-                val1, val2 = data1.get(key), data2.get(key)
-                if val1 != val2:
-                    differences_found = True
-                    print(f"  {key}:")
-                    print(f"    Fichier 1: {val1}")
-                    print(f"    Fichier 2: {val2}")
+            different_keys = _different_keys(data1, data2, common_keys)
+            differences_found = bool(different_keys)
+            for key in different_keys:
+                print(f"  {key}:")
+                print(f"    Fichier 1: {data1[key]}")
+                print(f"    Fichier 2: {data2[key]}")
             
             if not differences_found:
                 print("  Aucune différence trouvée dans les champs communs.")
@@ -538,12 +820,51 @@ def compare_metadata():
     except FileNotFoundError:
         print("❌ ExifTool non trouvé. Veuillez l'installer.")
     except subprocess.CalledProcessError as e:
-        print(f"❌ Erreur ExifTool: {e.stderr}")
+        print(f"❌ Erreur ExifTool: {stderr_text(e.stderr)}")
     except json.JSONDecodeError:
         print("❌ Erreur de décodage JSON.")
     except Exception as e:
         print(f"❌ Erreur inattendue: {e}")
 
+def _search_files(files, search_term):
+    """
+    Recherche un terme dans les métadonnées d'un bloc de fichiers (exécuté dans un processus du pool).
+    
+    Args:
+        files (list): Fichiers à analyser
+        search_term (str): Terme recherché
+        
+    Returns:
+        list: Tuples (fichier, champ, valeur) correspondants
+    """
+    found_files = []
+    term = search_term.lower()
+    # Sans caractère échappé par JSON, le terme apparaît tel quel dans la sortie brute
+    # d'une valeur qui le contient : on peut écarter un fichier sans décoder son JSON
+    prefilter = not any(c in search_term for c in '"\\') and search_term.isprintable()
+    
+    # Un seul processus ExifTool pour lire tous les fichiers du bloc
+    # ('-fast' et non '-fast2' : la recherche porte aussi sur les MakerNotes, objectif, n° de série...)
+    with PersistentExifTool() as exiftool:
+        for file in files:
+            output = exiftool.execute('-charset', 'filename=utf8', '-charset', 'exiftool=utf8', '-j', '-fast', file)
+            if prefilter and term not in output.decode("utf-8", errors="replace").lower():
+                continue
+            
+            data = parse_json(output)[0]
+            
+            # Recherche dans toutes les valeurs
+            # (le terme est mis en minuscules une seule fois, pas à chaque valeur)
+            for key, value in data.items():
+                if isinstance(value, str):
+                    if term in value.lower():
+                        found_files.append((file, key, value))
+                        break
+                elif isinstance(value, list) and any(isinstance(item, str) and term in item.lower() for item in value):
+                    found_files.append((file, key, value))
+    
+    return found_files
+
 def search_metadata():
     """
     Recherche des fichiers contenant une valeur spécifique dans leurs métadonnées.
@@ -566,26 +887,18 @@ def search_metadata():
     
     print(f"\n🔍 Recherche de '{search_term}' dans {len(files)} fichier(s)...")
     
+    # Découpe la liste en blocs contigus (ordre des résultats conservé), un par processus
+    workers = min(os.cpu_count() or 1, len(files))
+    chunk_size = -(-len(files) // workers)
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    
     found_files = []
     
     try:
-        for file in files:
-            cmd = ['exiftool', '-charset', 'filename=utf8', '-charset', 'exiftool=utf8', '-j', file]
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                  encoding="utf-8", check=True)
-            
-            data = json.loads(result.stdout)[0]
-            
-            # Recherche dans toutes les valeurs
-            for key, value in data.items():
-                if isinstance(value, str) and search_term.lower() in value.lower():
-                    found_files.append((file, key, value))
-                    break
-                elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, str) and search_term.lower() in item.lower():
-                            found_files.append((file, key, value))
-                            break
+        # Chaque processus interroge son propre ExifTool persistant
+        with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+            for hits in executor.map(_search_files, chunks, [search_term] * len(chunks)):
+                found_files.extend(hits)
         
         print("\n" + "="*80)
         print(f"📋 RÉSULTATS DE RECHERCHE POUR '{search_term}'")
@@ -638,6 +951,15 @@ def main():
     print("🎯 Bienvenue dans le gestionnaire de métadonnées d'images!")
     print("📋 Ce script utilise ExifTool pour gérer les métadonnées de vos images.")
     
+    try:
+        run_menu()
+    finally:
+        close_exiftool_session()
+
+def run_menu():
+    """
+    Boucle du menu interactif, jusqu'à ce que l'utilisateur décide de quitter.
+    """
     while True:
         display_menu()
         
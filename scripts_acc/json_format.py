@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Détection du format des fichiers de métadonnées : liste JSON ou NDJSON
+
+Partagé par metadata_manager.py et paginate_metadata.py. Un fichier NDJSON contient un
+objet JSON complet par ligne ; un objet JSON indenté sur plusieurs lignes commence
+aussi par '{' mais n'est pas du NDJSON.
+
+Auteur: Geoffroy Streit / Hylst
+Date: 2024
+"""
+
+import json
+from pathlib import Path
+from typing import Union
+
+try:
+    import orjson  # Optionnel: parsing JSON beaucoup plus rapide
+except ImportError:
+    orjson = None
+
+# Extensions toujours lues comme un objet JSON par ligne
+NDJSON_SUFFIXES = frozenset({'.ndjson', '.jsonl'})
+
+def is_ndjson(path: Union[str, Path]) -> bool:
+    """Indique si un fichier de métadonnées est au format NDJSON (un objet par ligne)
+
+    Vrai pour les extensions .ndjson/.jsonl, ou si la première ligne non vide est
+    à elle seule un objet JSON complet. Un objet indenté (première ligne '{')
+    ou une liste JSON ne sont pas du NDJSON.
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        True si le fichier doit être lu ligne par ligne
+    """
+    path = Path(path)
+    if path.suffix.lower() in NDJSON_SUFFIXES:
+        return True
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith(b"{"):
+                return False
+            try:
+                return isinstance(loads(line), dict)
+            except ValueError:
+                return False
+    return False
@@ -11,17 +11,32 @@ Auteur: Geoffroy Streit / Hylst
 Date: 2024
 """
 
+import io
 import json
+import mmap
 import pathlib
 import argparse
 import sys
 import os
-from typing import Dict, List, Optional, Any
+import itertools
+import subprocess
+import struct
+import shutil
+import tempfile
+import concurrent.futures
+from typing import Dict, Iterator, List, Optional, Any
 from PIL import Image as PILImage
 from PIL.ExifTags import TAGS
 import pyexiv2
 import logging
 
+try:
+    import orjson  # Optionnel: parsing/sérialisation JSON beaucoup plus rapide
+except ImportError:
+    orjson = None
+
+from json_format import is_ndjson
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,72 +47,299 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Entrée de base d'une image, copiée pour chaque fichier (ordre des clés du JSON de sortie)
+_METADATA_TEMPLATE = {
+    "Fichier": "",
+    "Taille": "",
+    "Type": "",
+    "Largeur": None,
+    "Hauteur": None,
+    "Categorie": "",
+    "Categorie secondaire": "",
+    "Createur": "Geoffroy Streit / Hylst",
+    "Description": "",
+    "Mots cles": [],
+    "Titre": "",
+    "Caracteristiques": [],
+    "Perception": "",
+    "Conte": ""
+}
+
+def _shift_round(value: int, shift: int) -> int:
+    """Divise par 2**shift en arrondissant au pair le plus proche (comme le formatage des floats)"""
+    quotient = value >> shift
+    remainder = value - (quotient << shift)
+    half = 1 << (shift - 1)
+    if remainder > half or (remainder == half and quotient & 1):
+        quotient += 1
+    return quotient
+
+def _format_size(file_size: int) -> str:
+    """Formate une taille de fichier en B, kB ou MB, en arithmétique entière"""
+    if file_size < 1024:
+        return f"{file_size} B"
+    if file_size < 1024 * 1024:
+        return f"{_shift_round(file_size, 10)} kB"
+    tenths = _shift_round(file_size * 10, 20)
+    return f"{tenths // 10}.{tenths % 10} MB"
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Blocs PNG pouvant porter des métadonnées (XMP/IPTC dans iTXt/zTXt, EXIF dans eXIf)
+_PNG_METADATA_CHUNKS = frozenset({b"tEXt", b"iTXt", b"zTXt", b"eXIf"})
+
+def _png_dimensions_without_metadata(image_path: pathlib.Path) -> Optional[tuple]:
+    """Parcourt les en-têtes de blocs d'un PNG sans lire leur contenu
+    
+    Args:
+        image_path: Chemin vers l'image PNG
+        
+    Returns:
+        (largeur, hauteur) lues dans IHDR si le fichier ne contient aucun bloc de
+        métadonnées, None sinon (ou si le fichier n'est pas un PNG valide)
+    """
+    with open(image_path, 'rb') as f:
+        if f.read(8) != _PNG_SIGNATURE:
+            return None
+        header = f.read(16)
+        if len(header) < 16 or header[4:8] != b"IHDR":
+            return None
+        dimensions = struct.unpack(">II", header[8:16])
+        f.seek(4 + 4 + 1, 1)  # Fin des données IHDR (8 octets lus sur 13) + CRC
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            length, chunk_type = struct.unpack(">I4s", chunk)
+            if chunk_type in _PNG_METADATA_CHUNKS:
+                return None
+            if chunk_type == b"IEND":
+                return dimensions
+            f.seek(length + 4, 1)  # Données + CRC
+
+def _lang_default(value: Any) -> Optional[str]:
+    """Valeur d'un champ XMP LangAlt (entrée x-default) ou chaîne simple"""
+    if isinstance(value, dict):
+        return value.get('lang="x-default"')
+    if isinstance(value, str):
+        return value
+    return None
+
+def _first_or_str(value: Any) -> Optional[str]:
+    """Premier élément d'un champ XMP Seq/Bag ou chaîne simple"""
+    if isinstance(value, list):
+        return value[0] if value else None
+    if isinstance(value, str):
+        return value
+    return None
+
+def _identity(value: Any) -> Any:
+    """Valeur reprise telle quelle"""
+    return value
+
+# Correspondance balise lue -> champ du JSON de sortie, avec la conversion à appliquer
+_XMP_FIELDS = (
+    ('Xmp.dc.title', "Titre", _lang_default),
+    ('Xmp.dc.description', "Description", _lang_default),
+    ('Xmp.dc.creator', "Createur", _first_or_str),
+    ('Xmp.photoshop.Instructions', "Perception", _identity),  # Perception (story)
+    ('Xmp.dc.rights', "Conte", _identity),  # Conte (comment)
+)
+_IPTC_FIELDS = (
+    ('Iptc.Application2.Category', "Categorie", _identity),
+    ('Iptc.Application2.SuppCategory', "Categorie secondaire", _identity),
+)
+
+def _apply_field_map(data: Dict[str, Any], fields: tuple, metadata: Dict[str, Any]) -> None:
+    """Recopie dans metadata les balises présentes de data selon une table de correspondance"""
+    for key, field, convert in fields:
+        value = data.get(key)
+        if value is not None:
+            value = convert(value)
+            if value is not None:
+                metadata[field] = value
+
+# Nombre d'images dont la lecture est anticipée pendant l'extraction
+PREFETCH_DEPTH = 16
+
+def _prefetch_file(path: str) -> None:
+    """Demande au noyau de précharger un fichier en cache (sans effet hors Linux/Unix)"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _load_json_file(path: pathlib.Path) -> Any:
+    """Charge un fichier JSON ; avec orjson, le fichier est projeté en mémoire (mmap)
+    et analysé directement depuis le cache de pages, sans copie intermédiaire en bytes
+    
+    Un fichier NDJSON (un objet complet par ligne, voir json_format.is_ndjson) est lu
+    ligne par ligne et renvoyé sous forme de liste.
+    """
+    if is_ndjson(path):
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(path, 'rb') as f:
+            return [loads(line) for line in f if line.strip()]
+    if orjson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Fichier vide : impossible à projeter
+            return orjson.loads(f.read())
+        with mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
+
+def _dump_json_line(record: Any) -> bytes:
+    """Sérialise un élément sur une seule ligne NDJSON, en bytes UTF-8 (orjson si disponible)"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n"
+
+def _dump_json_record(record: Any) -> bytes:
+    """Sérialise un élément indenté de 2 espaces, en bytes UTF-8 (orjson si disponible)"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    return json.dumps(record, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _field_fragment(key: str, value: Any) -> bytes:
+    """Ligne '"clé": valeur' d'un enregistrement, indentée comme dans _dump_json_record"""
+    return b'  ' + _dump_json_record(key) + b': ' + _dump_json_record(value).replace(b"\n", b"\n  ")
+
+# Fragments pré-sérialisés des valeurs par défaut du modèle (Createur, champs vides...)
+_TEMPLATE_KEYS = tuple(_METADATA_TEMPLATE)
+_TEMPLATE_FRAGMENTS = {key: _field_fragment(key, value) for key, value in _METADATA_TEMPLATE.items()}
+
+def _dump_metadata_record(metadata: Dict[str, Any]) -> bytes:
+    """Sérialise une entrée image en ne réencodant que les champs différents du modèle
+    
+    Produit exactement la même sortie que _dump_json_record.
+    """
+    if tuple(metadata) != _TEMPLATE_KEYS:
+        return _dump_json_record(metadata)
+    parts = []
+    for key, default in _METADATA_TEMPLATE.items():
+        value = metadata[key]
+        if value == default and type(value) is type(default):
+            parts.append(_TEMPLATE_FRAGMENTS[key])
+        else:
+            parts.append(_field_fragment(key, value))
+    return b"{\n" + b",\n".join(parts) + b"\n}"
+
 class MetadataManager:
     """Gestionnaire pour l'extraction et l'application de métadonnées d'images"""
     
-    def __init__(self, verbose: bool = False):
+    # Balises lues par le backend ExifTool (clé JSON retournée -> balise demandée)
+    EXIFTOOL_TAGS = {
+        "Title": "XMP-dc:Title",
+        "Description": "XMP-dc:Description",
+        "Subject": "XMP-dc:Subject",
+        "Creator": "XMP-dc:Creator",
+        "Instructions": "XMP-photoshop:Instructions",
+        "Rights": "XMP-dc:Rights",
+        "Category": "IPTC:Category",
+        "SupplementalCategories": "IPTC:SupplementalCategories",
+        "Keywords": "IPTC:Keywords",
+        "ImageWidth": "ImageWidth",
+        "ImageHeight": "ImageHeight",
+    }
+    
+    def __init__(self, verbose: bool = False, jobs: Optional[int] = None, backend: str = 'pyexiv2'):
         """Initialise le gestionnaire de métadonnées
         
         Args:
             verbose: Active le mode verbeux pour plus de logs
+            jobs: Nombre de processus de traitement (par défaut: nombre de cœurs, 1 = séquentiel)
+            backend: Lecture des métadonnées à l'extraction : 'pyexiv2' (une ouverture par image)
+                ou 'exiftool' (un seul appel ExifTool pour tout le répertoire)
         """
         self.verbose = verbose
-        self.supported_extensions = {'.jpg', '.jpeg', '.png'}
+        self.jobs = jobs or os.cpu_count() or 1
+        self.backend = backend
+        self.supported_extensions = frozenset({'.jpg', '.jpeg', '.png'})
         
         if verbose:
             logger.setLevel(logging.DEBUG)
     
-    def extract_metadata_from_directory(self, directory_path: str, output_file: str = None) -> bool:
+    def extract_metadata(self, directory_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Extrait en mémoire les métadonnées de toutes les images d'un répertoire
+        
+        Args:
+            directory_path: Chemin du répertoire contenant les images
+            
+        Returns:
+            Liste des métadonnées (même contenu que le fichier JSON d'extraction),
+            ou None si le répertoire n'existe pas ou ne contient aucune image
+        """
+        try:
+            image_files = self._find_images(directory_path)
+            if image_files is None:
+                return None
+            
+            metadata_list = list(self._iter_metadata(image_files))
+            # Listes indépendantes pour l'appelant : l'extraction partage une seule liste
+            # entre les deux champs, ce qui ne vaut que pour l'écriture du fichier JSON
+            for metadata in metadata_list:
+                metadata["Caracteristiques"] = list(metadata["Caracteristiques"])
+            logger.info(f"📊 {len(metadata_list)} images traitées avec succès")
+            return metadata_list
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'extraction des métadonnées: {str(e)}")
+            return None
+    
+    def extract_metadata_from_directory(self, directory_path: str, output_file: str = None,
+                                        output_format: str = 'array') -> bool:
         """Extrait les métadonnées de toutes les images d'un répertoire vers un fichier JSON
         
         Args:
             directory_path: Chemin du répertoire contenant les images
-            output_file: Chemin du fichier JSON de sortie (par défaut: metadata.json dans le répertoire des images)
+            output_file: Chemin du fichier JSON de sortie (par défaut: metadata.json, ou metadata.ndjson,
+                dans le répertoire des images)
+            output_format: 'array' (liste JSON indentée) ou 'ndjson' (un objet JSON compact par ligne)
             
         Returns:
             True si l'extraction s'est bien passée, False sinon
         """
         try:
-            directory = pathlib.Path(directory_path)
-            if not directory.exists() or not directory.is_dir():
-                logger.error(f"❌ Le répertoire {directory_path} n'existe pas ou n'est pas un dossier")
+            image_files = self._find_images(directory_path)
+            if image_files is None:
                 return False
             
             # Définir le fichier de sortie par défaut dans le répertoire des images
             if output_file is None:
-                output_file = directory / "metadata.json"
-            
-            # Rechercher toutes les images supportées (éviter les doublons)
-            image_files = set()
-            for ext in self.supported_extensions:
-                image_files.update(directory.glob(f"*{ext}"))
-                image_files.update(directory.glob(f"*{ext.upper()}"))
+                output_file = pathlib.Path(directory_path) / ("metadata.ndjson" if output_format == 'ndjson' else "metadata.json")
             
-            # Convertir en liste pour le traitement
-            image_files = list(image_files)
-            
-            if not image_files:
-                logger.warning(f"⚠️ Aucune image trouvée dans {directory_path}")
-                return False
-            
-            logger.info(f"📁 Traitement de {len(image_files)} images dans {directory_path}")
-            
-            # Extraire les métadonnées de chaque image
-            metadata_collection = []
-            for image_file in image_files:
-                metadata = self._extract_single_image_metadata(image_file)
-                if metadata:
-                    metadata_collection.append(metadata)
-            
-            # Sauvegarder le JSON
             output_path = pathlib.Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata_collection, f, ensure_ascii=False, indent=2)
+            # Écrire chaque entrée dès qu'elle est prête, sans garder toute la liste en mémoire.
+            # Au format 'array', le fichier produit est identique à json.dump(indent=2, ensure_ascii=False).
+            processed_count = 0
+            ndjson = output_format == 'ndjson'
+            with open(output_path, 'wb') as f:
+                if not ndjson:
+                    f.write(b"[")
+                for metadata in self._iter_metadata(image_files):
+                    if ndjson:
+                        f.write(_dump_json_line(metadata))
+                    else:
+                        f.write(b"\n  " if processed_count == 0 else b",\n  ")
+                        f.write(_dump_metadata_record(metadata).replace(b"\n", b"\n  "))
+                    processed_count += 1
+                if not ndjson:
+                    f.write(b"\n]" if processed_count else b"]")
             
             logger.info(f"✅ Métadonnées extraites et sauvegardées dans {output_file}")
-            logger.info(f"📊 {len(metadata_collection)} images traitées avec succès")
+            logger.info(f"📊 {processed_count} images traitées avec succès")
             
             return True
             
@@ -105,95 +347,208 @@ class MetadataManager:
             logger.error(f"❌ Erreur lors de l'extraction des métadonnées: {str(e)}")
             return False
     
-    def _extract_single_image_metadata(self, image_path: pathlib.Path) -> Optional[Dict[str, Any]]:
-        """Extrait les métadonnées d'une seule image
+    def _find_images(self, directory_path: str) -> Optional[List[str]]:
+        """Liste les images supportées d'un répertoire, triées par chemin
+        
+        Args:
+            directory_path: Chemin du répertoire contenant les images
+            
+        Returns:
+            Chemins des images, ou None (erreur journalisée) si le répertoire
+            n'existe pas ou ne contient aucune image
+        """
+        directory = pathlib.Path(directory_path)
+        if not directory.exists() or not directory.is_dir():
+            logger.error(f"❌ Le répertoire {directory_path} n'existe pas ou n'est pas un dossier")
+            return None
+        
+        # Rechercher toutes les images supportées en un seul parcours du répertoire
+        # (extension comparée en minuscules : .jpg, .JPG, .Jpg...)
+        with os.scandir(directory) as entries:
+            image_files = sorted(
+                e.path for e in entries
+                if e.is_file() and os.path.splitext(e.name)[1].lower() in self.supported_extensions
+            )
+        
+        if not image_files:
+            logger.warning(f"⚠️ Aucune image trouvée dans {directory_path}")
+            return None
+        
+        logger.info(f"📁 Traitement de {len(image_files)} images dans {directory_path}")
+        return image_files
+    
+    def _iter_metadata(self, image_files: List[str]) -> Iterator[Dict[str, Any]]:
+        """Extrait les métadonnées de chaque image avec le backend choisi
+        
+        Args:
+            image_files: Chemins des images
+            
+        Yields:
+            Métadonnées de chaque image lue avec succès, dans l'ordre des chemins
+        """
+        # Extraire les métadonnées de chaque image (en parallèle sur plusieurs processus)
+        if self.backend == 'exiftool':
+            records = self._extract_metadata_with_exiftool(image_files)
+            prefetch = ()
+        else:
+            # Lecture anticipée des fichiers suivants pendant le traitement des images courantes
+            for image_file in image_files[:PREFETCH_DEPTH]:
+                _prefetch_file(image_file)
+            prefetch = image_files[PREFETCH_DEPTH:]
+            records = self._map(self._extract_single_image_metadata, image_files)
+        
+        for index, metadata in enumerate(records):
+            if index < len(prefetch):
+                _prefetch_file(prefetch[index])
+            if metadata:
+                yield metadata
+    
+    def _map(self, func, *iterables) -> Iterator[Any]:
+        """Applique une méthode du gestionnaire à chaque élément, sur `self.jobs` processus
+        
+        Les images sont indépendantes : chaque appel peut s'exécuter dans un processus
+        séparé. Les résultats sont produits au fur et à mesure, dans l'ordre des entrées.
+        
+        Args:
+            func: Méthode à appliquer (doit être sérialisable, comme les méthodes de cette classe)
+            *iterables: Arguments à distribuer, comme pour map()
+            
+        Yields:
+            Résultat de chaque appel
+        """
+        tasks = list(zip(*iterables))
+        if self.jobs <= 1 or len(tasks) <= 1:
+            for args in tasks:
+                yield func(*args)
+            return
+        
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(self.jobs, len(tasks))) as executor:
+            yield from executor.map(func, *zip(*tasks), chunksize=8)
+    
+    @staticmethod
+    def _base_metadata(image_path: pathlib.Path) -> Dict[str, Any]:
+        """Construit l'entrée de base d'une image (taille du fichier, champs vides)
         
         Args:
             image_path: Chemin vers l'image
             
+        Returns:
+            Dictionnaire au format JSON de sortie, dimensions à None
+        """
+        metadata = _METADATA_TEMPLATE.copy()
+        metadata["Fichier"] = image_path.name
+        metadata["Taille"] = _format_size(image_path.stat().st_size)
+        metadata["Type"] = f"image/{image_path.suffix[1:].lower()}"
+        # Liste propre à chaque image (la copie du modèle est superficielle), partagée par les deux
+        # champs : extract_metadata() la duplique avant de rendre les entrées à l'appelant
+        metadata["Mots cles"] = metadata["Caracteristiques"] = []
+        return metadata
+    
+    @staticmethod
+    def _fill_missing_dimensions(image_path: pathlib.Path, metadata: Dict[str, Any]) -> None:
+        """Lit les dimensions avec PIL si la lecture des métadonnées ne les a pas fournies"""
+        if not metadata["Largeur"] or not metadata["Hauteur"]:
+            with PILImage.open(image_path) as img:
+                metadata["Largeur"], metadata["Hauteur"] = img.size
+    
+    def _extract_metadata_with_exiftool(self, image_files: List[str]) -> List[Dict[str, Any]]:
+        """Extrait les métadonnées de toutes les images en un seul appel ExifTool
+        
+        Args:
+            image_files: Chemins des images
+            
+        Returns:
+            Liste des métadonnées des images lues par ExifTool
+        """
+        def as_list(value):
+            # ExifTool retourne une valeur seule ou une liste selon le nombre d'éléments
+            if value in (None, ""):
+                return []
+            return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+        
+        cmd = ['exiftool', '-j', '-charset', 'filename=utf8']
+        cmd += [f"-{tag}" for tag in self.EXIFTOOL_TAGS.values()]
+        cmd += ['-@', '-']
+        # Liste des fichiers sur l'entrée standard : pas de limite de longueur de ligne de commande
+        result = subprocess.run(cmd, input="\n".join(image_files).encode('utf-8'), capture_output=True)
+        # Les fichiers illisibles sont absents de la sortie JSON et signalés sur stderr
+        for line in result.stderr.decode('utf-8', errors='replace').splitlines():
+            logger.warning(f"⚠️ ExifTool: {line}")
+        items = (orjson.loads(result.stdout) if orjson is not None else json.loads(result.stdout)) if result.stdout else []
+        
+        records = []
+        for item in items:
+            image_path = pathlib.Path(item["SourceFile"])
+            try:
+                metadata = self._base_metadata(image_path)
+                metadata["Largeur"] = item.get("ImageWidth")
+                metadata["Hauteur"] = item.get("ImageHeight")
+                
+                for key, field in (("Title", "Titre"), ("Description", "Description"),
+                                   ("Instructions", "Perception"), ("Rights", "Conte"),
+                                   ("Category", "Categorie"), ("SupplementalCategories", "Categorie secondaire")):
+                    if key in item:
+                        metadata[field] = item[key] if isinstance(item[key], list) else str(item[key])
+                
+                creators = as_list(item.get("Creator"))
+                if creators:
+                    metadata["Createur"] = creators[0]
+                
+                # Mots-clés XMP puis IPTC, sans doublons, ordre d'origine conservé
+                keywords = list(dict.fromkeys(itertools.chain(as_list(item.get("Subject")), as_list(item.get("Keywords")))))
+                metadata["Mots cles"] = keywords
+                metadata["Caracteristiques"] = keywords
+                
+                self._fill_missing_dimensions(image_path, metadata)
+                records.append(metadata)
+            
+            except Exception as e:
+                logger.error(f"❌ Erreur extraction métadonnées {image_path.name}: {str(e)}")
+        
+        return records
+    
+    def _extract_single_image_metadata(self, image_path) -> Optional[Dict[str, Any]]:
+        """Extrait les métadonnées d'une seule image
+        
+        Args:
+            image_path: Chemin vers l'image (str ou Path)
+            
         Returns:
             Dictionnaire contenant les métadonnées ou None en cas d'erreur
         """
+        image_path = pathlib.Path(image_path)
         try:
             if self.verbose:
                 logger.debug(f"🔍 Extraction métadonnées: {image_path.name}")
             
-            # Informations de base avec PIL
-            with PILImage.open(image_path) as img:
-                width, height = img.size
-                file_size = image_path.stat().st_size
-                
-                # Formatage de la taille
-                if file_size < 1024:
-                    size_str = f"{file_size} B"
-                elif file_size < 1024 * 1024:
-                    size_str = f"{file_size / 1024:.0f} kB"
-                else:
-                    size_str = f"{file_size / (1024 * 1024):.1f} MB"
-            
-            # Métadonnées de base
-            metadata = {
-                "Fichier": image_path.name,
-                "Taille": size_str,
-                "Type": f"image/{image_path.suffix[1:].lower()}",
-                "Largeur": width,
-                "Hauteur": height,
-                "Categorie": "",
-                "Categorie secondaire": "",
-                "Createur": "Geoffroy Streit / Hylst",
-                "Description": "",
-                "Mots cles": [],
-                "Titre": "",
-                "Caracteristiques": [],
-                "Perception": "",
-                "Conte": ""
-            }
+            # Métadonnées de base (dimensions lues avec le reste par pyexiv2)
+            metadata = self._base_metadata(image_path)
+            
+            # PNG sans aucun bloc de métadonnées : l'en-tête IHDR suffit, inutile d'ouvrir pyexiv2
+            if image_path.suffix.lower() == '.png':
+                dimensions = _png_dimensions_without_metadata(image_path)
+                if dimensions is not None:
+                    metadata["Largeur"], metadata["Hauteur"] = dimensions
+                    return metadata
             
             # Tentative d'extraction des métadonnées XMP/IPTC avec pyexiv2
             try:
                 with pyexiv2.Image(str(image_path)) as img:
+                    # Dimensions lues dans l'en-tête par exiv2 : pas besoin d'ouvrir l'image une seconde fois
+                    metadata["Largeur"] = img.get_pixel_width()
+                    metadata["Hauteur"] = img.get_pixel_height()
+                    
                     # Lecture XMP
                     try:
                         xmp_data = img.read_xmp()
                         if xmp_data:
-                            # Titre
-                            if 'Xmp.dc.title' in xmp_data:
-                                title_data = xmp_data['Xmp.dc.title']
-                                if isinstance(title_data, dict) and 'lang="x-default"' in title_data:
-                                    metadata["Titre"] = title_data['lang="x-default"']
-                                elif isinstance(title_data, str):
-                                    metadata["Titre"] = title_data
-                            
-                            # Description
-                            if 'Xmp.dc.description' in xmp_data:
-                                desc_data = xmp_data['Xmp.dc.description']
-                                if isinstance(desc_data, dict) and 'lang="x-default"' in desc_data:
-                                    metadata["Description"] = desc_data['lang="x-default"']
-                                elif isinstance(desc_data, str):
-                                    metadata["Description"] = desc_data
+                            _apply_field_map(xmp_data, _XMP_FIELDS, metadata)
                             
                             # Mots-clés
-                            if 'Xmp.dc.subject' in xmp_data:
-                                keywords = xmp_data['Xmp.dc.subject']
-                                if isinstance(keywords, list):
-                                    metadata["Mots cles"] = keywords
-                                    metadata["Caracteristiques"] = keywords.copy()
-                            
-                            # Créateur
-                            if 'Xmp.dc.creator' in xmp_data:
-                                creator_data = xmp_data['Xmp.dc.creator']
-                                if isinstance(creator_data, list) and creator_data:
-                                    metadata["Createur"] = creator_data[0]
-                                elif isinstance(creator_data, str):
-                                    metadata["Createur"] = creator_data
-                            
-                            # Perception (story)
-                            if 'Xmp.photoshop.Instructions' in xmp_data:
-                                metadata["Perception"] = xmp_data['Xmp.photoshop.Instructions']
-                            
-                            # Conte (comment)
-                            if 'Xmp.dc.rights' in xmp_data:
-                                metadata["Conte"] = xmp_data['Xmp.dc.rights']
+                            keywords = xmp_data.get('Xmp.dc.subject')
+                            if isinstance(keywords, list):
+                                metadata["Mots cles"] = keywords
+                                metadata["Caracteristiques"] = keywords
                     
                     except Exception as xmp_error:
                         if self.verbose:
@@ -203,22 +558,15 @@ class MetadataManager:
                     try:
                         iptc_data = img.read_iptc()
                         if iptc_data:
-                            # Catégorie
-                            if 'Iptc.Application2.Category' in iptc_data:
-                                metadata["Categorie"] = iptc_data['Iptc.Application2.Category']
-                            
-                            # Catégorie secondaire
-                            if 'Iptc.Application2.SuppCategory' in iptc_data:
-                                metadata["Categorie secondaire"] = iptc_data['Iptc.Application2.SuppCategory']
+                            _apply_field_map(iptc_data, _IPTC_FIELDS, metadata)
                             
                             # Mots-clés IPTC (complément)
-                            if 'Iptc.Application2.Keywords' in iptc_data:
-                                iptc_keywords = iptc_data['Iptc.Application2.Keywords']
-                                if isinstance(iptc_keywords, list):
-                                    # Fusionner avec les mots-clés XMP
-                                    all_keywords = list(set(metadata["Mots cles"] + iptc_keywords))
-                                    metadata["Mots cles"] = all_keywords
-                                    metadata["Caracteristiques"] = all_keywords.copy()
+                            iptc_keywords = iptc_data.get('Iptc.Application2.Keywords')
+                            if isinstance(iptc_keywords, list):
+                                # Fusionner avec les mots-clés XMP (sans doublons, ordre d'origine conservé)
+                                all_keywords = list(dict.fromkeys(itertools.chain(metadata["Mots cles"], iptc_keywords)))
+                                metadata["Mots cles"] = all_keywords
+                                metadata["Caracteristiques"] = all_keywords
                     
                     except Exception as iptc_error:
                         if self.verbose:
@@ -228,6 +576,9 @@ class MetadataManager:
                 if self.verbose:
                     logger.debug(f"⚠️ Erreur pyexiv2 pour {image_path.name}: {str(pyexiv2_error)}")
             
+            # Repli sur PIL si pyexiv2 n'a pas pu fournir les dimensions
+            self._fill_missing_dimensions(image_path, metadata)
+            
             return metadata
             
         except Exception as e:
@@ -258,8 +609,29 @@ class MetadataManager:
                 return False
             
             # Charger les métadonnées JSON
-            with open(json_path, 'r', encoding='utf-8') as f:
-                metadata_list = json.load(f)
+            metadata_list = _load_json_file(json_path)
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur lors de l'application des métadonnées: {str(e)}")
+            return False
+        
+        return self.apply_metadata(metadata_list, target_directory)
+    
+    def apply_metadata(self, metadata_list: List[Dict[str, Any]], target_directory: str) -> bool:
+        """Applique une liste de métadonnées (format du JSON d'extraction) aux images d'un répertoire
+        
+        Args:
+            metadata_list: Métadonnées à appliquer, une entrée par image
+            target_directory: Répertoire contenant les images cibles
+            
+        Returns:
+            True si l'application s'est bien passée, False sinon
+        """
+        try:
+            target_dir = pathlib.Path(target_directory)
+            if not target_dir.exists() or not target_dir.is_dir():
+                logger.error(f"❌ Le répertoire cible {target_directory} n'existe pas")
+                return False
             
             if not isinstance(metadata_list, list):
                 logger.error(f"❌ Le fichier JSON doit contenir une liste de métadonnées")
@@ -267,27 +639,41 @@ class MetadataManager:
             
             logger.info(f"📁 Application des métadonnées à {len(metadata_list)} images")
             
-            success_count = 0
             error_count = 0
             
-            # Appliquer les métadonnées à chaque image
+            # Un seul parcours du répertoire au lieu d'un stat() par entrée
+            with os.scandir(target_dir) as entries:
+                existing = {e.name: e.path for e in entries if e.is_file()}
+            
+            # Vérifier chaque entrée et préparer les images à traiter
+            image_paths = []
+            valid_metadata = []
             for metadata in metadata_list:
                 if not isinstance(metadata, dict) or 'Fichier' not in metadata:
                     logger.warning(f"⚠️ Métadonnées invalides ignorées: {metadata}")
                     continue
                 
                 filename = metadata['Fichier']
-                image_path = target_dir / filename
+                image_path = existing.get(filename)
                 
-                if not image_path.exists():
+                if image_path is None:
                     logger.warning(f"⚠️ Image non trouvée: {filename}")
                     error_count += 1
                     continue
                 
-                if self._apply_single_image_metadata(image_path, metadata):
-                    success_count += 1
-                else:
-                    error_count += 1
+                image_paths.append(image_path)
+                valid_metadata.append(metadata)
+            
+            # Regrouper les images par format (tri stable) : les écritures JPG puis PNG
+            # s'enchaînent dans le même chemin de code d'Exiv2
+            order = sorted(range(len(image_paths)), key=lambda i: os.path.splitext(image_paths[i])[1].lower())
+            image_paths = [image_paths[i] for i in order]
+            valid_metadata = [valid_metadata[i] for i in order]
+            
+            # Appliquer les métadonnées à chaque image (en parallèle sur plusieurs processus)
+            results = list(self._map(self._apply_single_image_metadata, image_paths, valid_metadata))
+            success_count = sum(results)
+            error_count += len(results) - success_count
             
             logger.info(f"✅ Application terminée: {success_count} succès, {error_count} erreurs")
             return error_count == 0
@@ -296,16 +682,17 @@ class MetadataManager:
             logger.error(f"❌ Erreur lors de l'application des métadonnées: {str(e)}")
             return False
     
-    def _apply_single_image_metadata(self, image_path: pathlib.Path, metadata: Dict[str, Any]) -> bool:
+    def _apply_single_image_metadata(self, image_path, metadata: Dict[str, Any]) -> bool:
         """Applique les métadonnées à une seule image
         
         Args:
-            image_path: Chemin vers l'image
+            image_path: Chemin vers l'image (str ou Path)
             metadata: Dictionnaire contenant les métadonnées à appliquer
             
         Returns:
             True si l'application s'est bien passée, False sinon
         """
+        image_path = pathlib.Path(image_path)
         try:
             if self.verbose:
                 logger.debug(f"🔧 Application métadonnées: {image_path.name}")
@@ -356,15 +743,17 @@ class MetadataManager:
             if keywords:
                 iptc_data['Iptc.Application2.Keywords'] = keywords
             
-            # Application avec gestion d'erreur robuste
-            return self._write_metadata_robust(image_path, xmp_data, iptc_data)
+            # Application avec gestion d'erreur robuste, stratégie choisie selon le format
+            if image_path.suffix.lower() == '.png':
+                return self._write_png(image_path, xmp_data, iptc_data)
+            return self._write_jpg(image_path, xmp_data, iptc_data)
             
         except Exception as e:
             logger.error(f"❌ Erreur application métadonnées {image_path.name}: {str(e)}")
             return False
     
-    def _write_metadata_robust(self, image_path: pathlib.Path, xmp_data: Dict, iptc_data: Dict) -> bool:
-        """Écrit les métadonnées avec gestion d'erreur robuste (similaire à image_processor.py)
+    def _write_with_pyexiv2(self, image_path: pathlib.Path, xmp_data: Dict, iptc_data: Dict) -> bool:
+        """Écriture normale des métadonnées avec pyexiv2
         
         Args:
             image_path: Chemin vers l'image
@@ -372,52 +761,32 @@ class MetadataManager:
             iptc_data: Données IPTC à écrire
             
         Returns:
-            True si l'écriture s'est bien passée, False sinon
+            True si l'écriture s'est bien passée, False si une méthode de repli est nécessaire
         """
         try:
-            # Stratégie 1: Écriture normale avec pyexiv2
-            try:
-                with pyexiv2.Image(str(image_path)) as img:
-                    if xmp_data:
-                        img.modify_xmp(xmp_data)
-                    if iptc_data:
-                        img.modify_iptc(iptc_data)
-                
-                if self.verbose:
-                    logger.debug(f"✅ Métadonnées écrites (méthode normale): {image_path.name}")
-                return True
-                
-            except Exception as e:
-                if self.verbose:
-                    logger.debug(f"⚠️ Échec méthode normale pour {image_path.name}: {str(e)}")
-                
-                # Stratégie 2: Fallback avec nettoyage PIL
-                return self._write_metadata_fallback(image_path, xmp_data, iptc_data)
-        
+            with pyexiv2.Image(str(image_path)) as img:
+                if xmp_data:
+                    img.modify_xmp(xmp_data)
+                if iptc_data:
+                    img.modify_iptc(iptc_data)
         except Exception as e:
-            logger.error(f"❌ Erreur complète écriture métadonnées {image_path.name}: {str(e)}")
+            if self.verbose:
+                logger.debug(f"⚠️ Échec méthode normale pour {image_path.name}: {str(e)}")
             return False
-    
-    def _write_metadata_fallback(self, image_path: pathlib.Path, xmp_data: Dict, iptc_data: Dict) -> bool:
-        """Méthode de fallback pour l'écriture des métadonnées
-        
-        Args:
-            image_path: Chemin vers l'image
-            xmp_data: Données XMP à écrire
-            iptc_data: Données IPTC à écrire
-            
-        Returns:
-            True si l'écriture s'est bien passée, False sinon
-        """
-        try:
-            if image_path.suffix.lower() == '.png':
-                return self._write_png_metadata_only(image_path, xmp_data)
-            else:
-                return self._write_jpg_metadata_simple(image_path, xmp_data, iptc_data)
         
-        except Exception as e:
-            logger.error(f"❌ Erreur fallback {image_path.name}: {str(e)}")
-            return False
+        if self.verbose:
+            logger.debug(f"✅ Métadonnées écrites (méthode normale): {image_path.name}")
+        return True
+    
+    def _write_png(self, image_path: pathlib.Path, xmp_data: Dict, iptc_data: Dict) -> bool:
+        """Écrit les métadonnées d'un PNG : pyexiv2, puis blocs texte PIL en repli"""
+        return (self._write_with_pyexiv2(image_path, xmp_data, iptc_data)
+                or self._write_png_metadata_only(image_path, xmp_data))
+    
+    def _write_jpg(self, image_path: pathlib.Path, xmp_data: Dict, iptc_data: Dict) -> bool:
+        """Écrit les métadonnées d'un JPG : pyexiv2, puis nettoyage des EXIF en repli"""
+        return (self._write_with_pyexiv2(image_path, xmp_data, iptc_data)
+                or self._write_jpg_metadata_simple(image_path, xmp_data, iptc_data))
     
     def _write_png_metadata_only(self, image_path: pathlib.Path, xmp_data: Dict) -> bool:
         """Écriture métadonnées PNG avec PIL
@@ -468,6 +837,10 @@ class MetadataManager:
     def _write_jpg_metadata_simple(self, image_path: pathlib.Path, xmp_data: Dict, iptc_data: Dict) -> bool:
         """Écriture métadonnées JPG avec approche alternative
         
+        Les segments EXIF (souvent corrompus quand l'écriture normale échoue) sont retirés
+        sans toucher aux données compressées : les pixels restent identiques à l'original.
+        Si le fichier n'est pas un flux JPEG analysable, l'image est réencodée avec PIL.
+        
         Args:
             image_path: Chemin vers l'image JPG
             xmp_data: Données XMP à écrire
@@ -477,52 +850,114 @@ class MetadataManager:
             True si l'écriture s'est bien passée, False sinon
         """
         try:
-            import tempfile
-            import shutil
-            
-            if self.verbose:
-                logger.debug(f"🔧 Utilisation de PIL pour contourner les EXIF corrompus")
-            
-            # Ouvrir l'image avec PIL (ignore les EXIF corrompus)
-            with PILImage.open(image_path) as img:
-                # Convertir en RGB si nécessaire
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Créer un fichier temporaire
-                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                    temp_path = temp_file.name
+            try:
+                # Suppression sans perte des segments EXIF, entièrement en mémoire
+                clean_data = _strip_jpeg_exif(image_path.read_bytes())
+                if self.verbose:
+                    logger.debug(f"🔧 Segments EXIF retirés sans réencodage: {image_path.name}")
+            except ValueError:
+                if self.verbose:
+                    logger.debug(f"🔧 Utilisation de PIL pour contourner les EXIF corrompus")
                 
-                # Sauvegarder l'image sans les EXIF corrompus
-                img.save(temp_path, 'JPEG', quality=95, optimize=True)
+                # Ouvrir l'image avec PIL (ignore les EXIF corrompus)
+                with PILImage.open(image_path) as img:
+                    # Convertir en RGB si nécessaire
+                    if img.mode != 'RGB':
+                        img = img.convert('RGB')
+                    
+                    # Réencoder l'image sans les EXIF corrompus (sans seconde passe Huffman)
+                    buffer = io.BytesIO()
+                    img.save(buffer, 'JPEG', quality=95)
+                    clean_data = buffer.getvalue()
             
             # Maintenant essayer d'ajouter les métadonnées XMP avec pyexiv2 sur l'image "propre"
+            success = True
             try:
-                with pyexiv2.Image(temp_path) as clean_img:
+                with pyexiv2.ImageData(clean_data) as clean_img:
                     if xmp_data:
                         clean_img.modify_xmp(xmp_data)
                     if iptc_data:
                         clean_img.modify_iptc(iptc_data)
-                
-                # Remplacer l'image originale par la version nettoyée avec métadonnées
-                shutil.move(temp_path, str(image_path))
-                
-                if self.verbose:
-                    logger.debug(f"✅ Image nettoyée et métadonnées ajoutées: {image_path.name}")
-                
-                return True
-                
+                    clean_data = clean_img.get_bytes()
             except Exception as xmp_error:
                 # Si même l'image nettoyée échoue, au moins on a une image sans EXIF corrompus
-                shutil.move(temp_path, str(image_path))
+                success = False
                 if self.verbose:
                     logger.debug(f"⚠️ Image nettoyée mais métadonnées non ajoutées: {str(xmp_error)}")
-                return False
+            
+            # Remplacement atomique : l'original reste intact si l'écriture est interrompue
+            _replace_file_atomically(image_path, clean_data)
+            
+            if success and self.verbose:
+                logger.debug(f"✅ Image nettoyée et métadonnées ajoutées: {image_path.name}")
+            
+            return success
                 
         except Exception as e:
             logger.error(f"❌ Erreur JPG fallback PIL {image_path.name}: {str(e)}")
             return False
 
+def _replace_file_atomically(path: pathlib.Path, data: bytes) -> None:
+    """Remplace le contenu d'un fichier via un fichier temporaire voisin et os.replace
+    
+    Les permissions de l'original sont conservées ; en cas d'erreur (disque plein,
+    interruption...), le fichier temporaire est supprimé et l'original n'est pas modifié.
+    
+    Args:
+        path: Fichier à remplacer
+        data: Nouveau contenu
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def _strip_jpeg_exif(data: bytes) -> bytes:
+    """Retire les segments APP1 EXIF d'un flux JPEG sans toucher aux données de l'image
+    
+    Les autres segments (dont l'APP1 XMP) et tout ce qui suit le début du scan (SOS)
+    sont recopiés tels quels.
+    
+    Args:
+        data: Contenu du fichier JPEG
+        
+    Returns:
+        Contenu du fichier sans segment EXIF
+        
+    Raises:
+        ValueError: Si les données ne sont pas un flux JPEG analysable
+    """
+    if data[:2] != b"\xff\xd8":
+        raise ValueError("pas un fichier JPEG (marqueur SOI absent)")
+    
+    output = [data[:2]]
+    pos = 2
+    while pos < len(data):
+        if data[pos] != 0xFF:
+            raise ValueError(f"marqueur JPEG attendu à l'offset {pos}")
+        # Octets de remplissage 0xFF autorisés avant un marqueur
+        while pos + 1 < len(data) and data[pos + 1] == 0xFF:
+            pos += 1
+        if pos + 3 >= len(data):
+            raise ValueError("segment JPEG tronqué")
+        marker = data[pos + 1]
+        if marker == 0xDA or marker == 0xD9:  # SOS : le reste est l'image compressée ; EOI
+            output.append(data[pos:])
+            return b"".join(output)
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        end = pos + 2 + length
+        if length < 2 or end > len(data):
+            raise ValueError(f"longueur de segment invalide à l'offset {pos}")
+        if not (marker == 0xE1 and data[pos + 4:pos + 10] == b"Exif\x00\x00"):
+            output.append(data[pos:end])
+        pos = end
+    raise ValueError("début du scan (SOS) introuvable")
+
 def main():
     """Fonction principale du script"""
     parser = argparse.ArgumentParser(
@@ -538,6 +973,12 @@ Exemples d'utilisation:
   
   # Mode verbeux
   python metadata_manager.py extract ./images metadata.json --verbose
+  
+  # Limiter le nombre de processus
+  python metadata_manager.py apply metadata.json ./images --jobs 2
+  
+  # Extraire au format NDJSON (un objet par ligne ; détecté automatiquement par apply)
+  python metadata_manager.py extract ./images metadata.ndjson --format ndjson
         """
     )
     
@@ -563,15 +1004,37 @@ Exemples d'utilisation:
         help='Active le mode verbeux'
     )
     
+    parser.add_argument(
+        '--backend',
+        choices=['pyexiv2', 'exiftool'],
+        default='pyexiv2',
+        help="Lecture des métadonnées pour extract : pyexiv2 (par défaut) ou exiftool (un seul appel pour tout le répertoire)"
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=None,
+        help='Nombre de processus de traitement (par défaut: nombre de cœurs, 1 = séquentiel)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=['array', 'ndjson'],
+        default='array',
+        dest='output_format',
+        help="Format du fichier produit par extract : array (liste JSON indentée, par défaut) ou ndjson (un objet par ligne)"
+    )
+    
     args = parser.parse_args()
     
     # Créer le gestionnaire de métadonnées
-    manager = MetadataManager(verbose=args.verbose)
+    manager = MetadataManager(verbose=args.verbose, jobs=args.jobs, backend=args.backend)
     
     # Exécuter l'action demandée
     if args.action == 'extract':
         logger.info(f"🔍 Extraction des métadonnées de {args.source} vers {args.target}")
-        success = manager.extract_metadata_from_directory(args.source, args.target)
+        success = manager.extract_metadata_from_directory(args.source, args.target, args.output_format)
     else:  # apply
         logger.info(f"📝 Application des métadonnées de {args.source} vers {args.target}")
         success = manager.apply_metadata_from_json(args.source, args.target)
@@ -9,30 +9,175 @@ avec leur fichier metadata.json correspondant.
 
 Utilisation:
     python paginate_metadata.py
+    python paginate_metadata.py --mode hardlink   # liens physiques au lieu de copies
 
 Auteur: Geoffroy Streit / Hylst
 Date: 2024
 """
 
+import argparse
+import errno
 import json
+import logging
 import os
+import sys
 import shutil
 import math
+import itertools
+import operator
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import orjson  # Optionnel: parsing/sérialisation JSON beaucoup plus rapide
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Optionnel: lecture en flux de metadata.json, page par page
+except ImportError:
+    ijson = None
+
+from json_format import is_ndjson
+
+# Erreurs de décodage possibles selon le parseur utilisé
+JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson is not None else (json.JSONDecodeError,)
+
+# Détails par page (progression, fichiers manquants) ; --quiet n'affiche que les erreurs
+logger = logging.getLogger(__name__)
+
+# Clonage de fichiers (copy-on-write) : ioctl FICLONE sous Linux, clonefile() sous macOS
+FICLONE = 0x40049409
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_clonefile = None
+if sys.platform == 'darwin':
+    try:
+        import ctypes
+        _clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        _clonefile = None
+
+def _copy_clonefile(source_file: Path, dest_file: Path) -> bool:
+    """Clone copy-on-write via clonefile() (APFS) ; False si le clonage échoue"""
+    return _clonefile(os.fsencode(source_file), os.fsencode(dest_file), 0) == 0
+
+# Clonage FICLONE possible (Btrfs, XFS...) ; désactivé pour tout le processus au premier
+# échec, les pages étant créées sur le même système de fichiers que les images
+_reflink_supported = True
+
+def _copy_in_kernel(source_file: Path, dest_file: Path) -> bool:
+    """
+    Copie le contenu d'un fichier sans passer par l'espace utilisateur
+    
+    Essaie un clone copy-on-write (ioctl FICLONE), puis copy_file_range
+    (copie dans le noyau, côté serveur sur NFS/SMB récents).
+    
+    Returns:
+        True si le contenu a été copié, False si aucune méthode n'est disponible
+    """
+    global _reflink_supported
+    with open(source_file, 'rb') as src, open(dest_file, 'wb') as dst:
+        if _reflink_supported:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return True
+            except OSError:
+                _reflink_supported = False
+        if not hasattr(os, 'copy_file_range'):
+            return False
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            return False
+        return remaining == 0
+
+def _copy_with_stat(source_file: Path, dest_file: Path) -> None:
+    """
+    Copie un fichier avec ses métadonnées (dates, permissions), par clonage si possible
+    
+    Repli sur shutil.copy2 si le système de fichiers ne permet pas la copie dans le noyau.
+    """
+    if _copy_file_data(source_file, dest_file):
+        shutil.copystat(source_file, dest_file)
+    else:
+        shutil.copy2(source_file, dest_file)
+
+# Méthode de copie choisie une seule fois selon la plateforme (pas de test par fichier)
+if _clonefile is not None:
+    _copy_file_data = _copy_clonefile
+elif fcntl is not None:
+    _copy_file_data = _copy_in_kernel
+else:
+    _copy_file_data = None
+
+# Copie d'une image vers sa page ; shutil.copy2 utilise directement CopyFile2 sous Windows
+_fast_copy = _copy_with_stat if _copy_file_data is not None else shutil.copy2
+
+def _move_file(source_file: Path, dest_file: Path) -> None:
+    """Déplace un fichier par renommage, avec repli sur shutil.move entre systèmes de fichiers"""
+    try:
+        os.replace(source_file, dest_file)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source_file, dest_file)
+
+# Lecture du nom de fichier d'une entrée (appel C, sans valeur par défaut à construire)
+_get_filename = operator.itemgetter('Fichier')
+
+def _format_sample(items: List[str], limit: int = 5) -> str:
+    """Liste indentée des premiers éléments (5 par défaut), suivie du nombre restant"""
+    lines = [f"\n   - {item}" for item in items[:limit]]
+    if len(items) > limit:
+        lines.append(f"\n   ... et {len(items) - limit} autres")
+    return "".join(lines)
+
+# Façons de placer les images dans les pages
+TRANSFER_MODES = ("copy", "hardlink", "symlink", "move")
+
+# Répertoire courant au lancement, résolu une seule fois par processus
+_CWD = Path.cwd()
 
 class MetadataPaginator:
     """Gestionnaire pour la pagination des métadonnées d'images"""
     
-    def __init__(self, images_per_page: int = 30):
+    def __init__(self, images_per_page: int = 30, mode: str = "copy", max_concurrency: int = 8,
+                 root: Optional[Path] = None):
         """
         Initialise le paginateur de métadonnées
         
         Args:
             images_per_page: Nombre maximum d'images par page (défaut: 30)
+            mode: Placement des images dans les pages : "copy" (défaut), "hardlink",
+                "symlink" ou "move" (les originaux quittent le répertoire courant)
+            max_concurrency: Nombre maximum de fichiers transférés simultanément
+                (défaut: 8, assez pour remplir la file d'un SSD ou d'un partage réseau
+                sans saturer un disque mécanique ; 1 = séquentiel)
+            root: Répertoire contenant metadata.json et les images (défaut: répertoire
+                courant au lancement du script)
         """
+        if mode not in TRANSFER_MODES:
+            raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(TRANSFER_MODES)})")
         self.images_per_page = images_per_page
-        self.current_dir = Path.cwd()
+        self.mode = mode
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cleanup_executor: Optional[ThreadPoolExecutor] = None
+        self._source_index: Optional[Dict[str, str]] = None
+        # Images déplacées pendant paginate() (source, destination), pour les remettre en place en cas d'échec
+        self._moved: Optional[List[Tuple[Path, Path]]] = None
+        self.current_dir = _CWD if root is None else Path(root)
         self.metadata_file = self.current_dir / "metadata.json"
     
     def find_metadata_file(self) -> bool:
@@ -57,8 +202,11 @@ class MetadataPaginator:
             Liste des métadonnées d'images ou liste vide en cas d'erreur
         """
         try:
-            with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                metadata_list = json.load(f)
+            if orjson is not None:
+                metadata_list = orjson.loads(self.metadata_file.read_bytes())
+            else:
+                with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                    metadata_list = json.load(f)
             
             if not isinstance(metadata_list, list):
                 print("❌ Le fichier metadata.json doit contenir une liste")
@@ -74,6 +222,34 @@ class MetadataPaginator:
             print(f"❌ Erreur lors du chargement: {e}")
             return []
     
+    def _iter_metadata(self) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt les métadonnées une image à la fois, sans charger tout le fichier
+        
+        Un fichier JSON Lines (un objet complet par ligne, voir json_format.is_ndjson) est lu
+        ligne par ligne ; une liste JSON est lue en flux avec ijson s'il est installé,
+        sinon chargée d'un bloc.
+        
+        Yields:
+            Métadonnées de chaque image, dans l'ordre du fichier
+        """
+        if is_ndjson(self.metadata_file):
+            loads = orjson.loads if orjson is not None else json.loads
+            with open(self.metadata_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield loads(line)
+            return
+        with open(self.metadata_file, 'rb') as f:
+            first = f.read(4096).lstrip()[:1]
+            f.seek(0)
+            if first != b"[":
+                raise ValueError("Le fichier metadata.json doit contenir une liste")
+            if ijson is not None:
+                yield from ijson.items(f, 'item', use_float=True)
+                return
+        yield from self.load_metadata()
+    
     def calculate_pages(self, total_images: int) -> int:
         """
         Calcule le nombre de pages nécessaires
@@ -98,51 +274,130 @@ class MetadataPaginator:
         Returns:
             Liste des chemins des répertoires créés
         """
-        page_dirs = []
+        return [self.create_page_directory(page_num) for page_num in range(1, num_pages + 1)]
+    
+    def create_page_directory(self, page_num: int) -> Path:
+        """
+        Crée (ou vide s'il existe déjà) le répertoire numéroté d'une page
         
-        for page_num in range(1, num_pages + 1):
-            page_dir = self.current_dir / str(page_num)
+        Args:
+            page_num: Numéro de la page
             
-            # Créer le répertoire s'il n'existe pas
-            if page_dir.exists():
-                print(f"⚠️ Le répertoire {page_num} existe déjà, il sera vidé")
-                # Vider le répertoire existant
-                for item in page_dir.iterdir():
-                    if item.is_file():
-                        item.unlink()
-                    elif item.is_dir():
-                        shutil.rmtree(item)
-            else:
+        Returns:
+            Chemin du répertoire de la page
+        """
+        page_dir = self.current_dir / str(page_num)
+        
+        # Créer le répertoire s'il n'existe pas
+        if page_dir.exists():
+            logger.warning("⚠️ Le répertoire %d existe déjà, il sera vidé", page_num)
+            if self._discard_directory(page_dir):
                 page_dir.mkdir()
-                print(f"📁 Répertoire créé: {page_num}")
-            
-            page_dirs.append(page_dir)
+        else:
+            page_dir.mkdir()
+            logger.info("📁 Répertoire créé: %d", page_num)
         
-        return page_dirs
+        return page_dir
     
-    def split_metadata_by_pages(self, metadata_list: List[Dict[str, Any]], num_pages: int) -> List[List[Dict[str, Any]]]:
+    def install_page_directory(self, staged_dir: Path, page_num: int) -> Path:
         """
-        Divise la liste de métadonnées en pages
+        Met en place une page préparée dans le répertoire de travail, à la place de l'ancienne
         
         Args:
-            metadata_list: Liste complète des métadonnées
-            num_pages: Nombre de pages
+            staged_dir: Répertoire de la page préparé dans le répertoire de travail temporaire
+            page_num: Numéro de la page
             
         Returns:
-            Liste de listes, chaque sous-liste contenant les métadonnées d'une page
+            Chemin définitif du répertoire de la page
         """
-        pages_metadata = []
+        page_dir = self.current_dir / str(page_num)
+        if page_dir.exists():
+            logger.warning("⚠️ Le répertoire %d existe déjà, il sera remplacé", page_num)
+            if not self._discard_directory(page_dir):
+                page_dir.rmdir()
+        else:
+            logger.info("📁 Répertoire créé: %d", page_num)
+        os.replace(staged_dir, page_dir)
+        return page_dir
+    
+    def _discard_directory(self, directory: Path) -> bool:
+        """
+        Écarte un ancien répertoire de page d'un seul renommage
         
-        for page_num in range(num_pages):
-            start_idx = page_num * self.images_per_page
-            end_idx = min(start_idx + self.images_per_page, len(metadata_list))
-            
-            page_metadata = metadata_list[start_idx:end_idx]
-            pages_metadata.append(page_metadata)
+        Sa suppression se fait en arrière-plan pendant le traitement des pages.
+        
+        Returns:
+            True si le répertoire a été écarté, False s'il a seulement été vidé sur place
+        """
+        old_dir = directory.with_name(f".{directory.name}.old.{uuid.uuid4().hex}")
+        try:
+            os.replace(directory, old_dir)
+        except OSError:
+            # Renommage impossible (fichier ouvert sous Windows...) : vider sur place
+            self._empty_directory(directory)
+            return False
+        if self._cleanup_executor is not None:
+            self._cleanup_executor.submit(shutil.rmtree, old_dir, ignore_errors=True)
+        else:
+            shutil.rmtree(old_dir, ignore_errors=True)
+        return True
+    
+    def _abort_staging(self, staging_dir: Path) -> None:
+        """Remet en place les images déplacées et supprime le répertoire de travail temporaire"""
+        restored = 0
+        for source_file, dest_file in reversed(self._moved or ()):
+            try:
+                _move_file(dest_file, source_file)
+                restored += 1
+            except OSError as e:
+                logger.error("❌ Impossible de remettre en place %s (resté dans %s): %s", source_file.name, dest_file.parent, e)
+        if restored:
+            logger.warning("↩️ %d images déplacées remises à leur place", restored)
+        if not self._moved or restored == len(self._moved):
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _empty_directory(directory: Path) -> None:
+        """Vide un répertoire (type lu dans les entrées du parcours, sans stat())"""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+    
+    def iter_page_slices(self, total_images: int) -> Iterator[Tuple[int, int]]:
+        """
+        Bornes (début, fin exclue) de chaque page, sans construire les pages
+        
+        Args:
+            total_images: Nombre total d'images
             
-            print(f"📄 Page {page_num + 1}: {len(page_metadata)} images (indices {start_idx}-{end_idx-1})")
+        Yields:
+            Indices de début et de fin de chaque page
+        """
+        for start_idx in range(0, total_images, self.images_per_page):
+            yield start_idx, min(start_idx + self.images_per_page, total_images)
+    
+    def split_metadata_by_pages(self, metadata_list: List[Dict[str, Any]], num_pages: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Divise la liste de métadonnées en pages, une page à la fois
         
-        return pages_metadata
+        Chaque page n'est découpée qu'au moment où elle est consommée : les sous-listes
+        de toutes les pages ne coexistent jamais en mémoire.
+        
+        Args:
+            metadata_list: Liste complète des métadonnées
+            num_pages: Nombre maximum de pages
+            
+        Yields:
+            Métadonnées de chaque page
+        """
+        slices = itertools.islice(self.iter_page_slices(len(metadata_list)), num_pages)
+        for page_num, (start_idx, end_idx) in enumerate(slices, 1):
+            page_metadata = metadata_list[start_idx:end_idx]
+            logger.info("📄 Page %d: %d images (indices %d-%d)", page_num, len(page_metadata), start_idx, end_idx - 1)
+            yield page_metadata
     
     def save_page_metadata(self, page_dir: Path, page_metadata: List[Dict[str, Any]], page_num: int) -> bool:
         """
@@ -159,16 +414,93 @@ class MetadataPaginator:
         try:
             metadata_file = page_dir / "metadata.json"
             
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(page_metadata, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                # Sérialisation C en une seule écriture, sortie identique à json.dump(indent=2)
+                metadata_file.write_bytes(orjson.dumps(page_metadata, option=orjson.OPT_INDENT_2))
+            else:
+                with open(metadata_file, 'w', encoding='utf-8') as f:
+                    json.dump(page_metadata, f, ensure_ascii=False, indent=2)
             
-            print(f"💾 Métadonnées sauvegardées: {metadata_file} ({len(page_metadata)} images)")
+            logger.info("💾 Métadonnées sauvegardées: %s (%d images)", metadata_file, len(page_metadata))
             return True
             
         except Exception as e:
-            print(f"❌ Erreur sauvegarde page {page_num}: {e}")
+            logger.error("❌ Erreur sauvegarde page %d: %s", page_num, e)
             return False
     
+    def transfer_file(self, source_file: Path, dest_file: Path) -> None:
+        """
+        Place une image dans une page selon le mode choisi
+        
+        Les liens physiques et les déplacements ne modifient que les entrées de répertoire ;
+        entre deux systèmes de fichiers, ils se replient sur une copie (ou shutil.move).
+        
+        Args:
+            source_file: Image d'origine
+            dest_file: Emplacement dans le répertoire de la page
+        """
+        if self.mode == "copy":
+            _fast_copy(source_file, dest_file)
+            return
+        
+        if self.mode == "move":
+            _move_file(source_file, dest_file)
+            if self._moved is not None:
+                self._moved.append((source_file, dest_file))
+            return
+        
+        # Un lien ne remplace pas un fichier existant (nom en double dans metadata.json)
+        if dest_file.is_symlink() or dest_file.exists():
+            dest_file.unlink()
+        if self.mode == "symlink":
+            os.symlink(source_file.resolve(), dest_file)
+            return
+        try:
+            os.link(source_file, dest_file)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            _fast_copy(source_file, dest_file)
+    
+    def _find_source(self, filename: str) -> Optional[str]:
+        """
+        Cherche une image du répertoire courant dans l'index construit en un seul parcours
+        
+        Args:
+            filename: Nom du fichier indiqué dans les métadonnées
+            
+        Returns:
+            Chemin du fichier, ou None s'il n'existe pas
+        """
+        if os.sep in filename or (os.altsep and os.altsep in filename):
+            # Chemin relatif vers un sous-dossier : hors de l'index
+            source_file = self.current_dir / filename
+            return str(source_file) if source_file.is_file() else None
+        return self._get_source_index().get(filename)
+    
+    def _get_source_index(self) -> Dict[str, str]:
+        """Index nom -> chemin des fichiers du répertoire courant, construit en un seul parcours"""
+        if self._source_index is None:
+            with os.scandir(self.current_dir) as entries:
+                self._source_index = {e.name: e.path for e in entries if e.is_file()}
+        return self._source_index
+    
+    def _submit(self, func, *args) -> Future:
+        """Exécute func sur le groupe de threads s'il existe, sinon immédiatement"""
+        if self._executor is not None:
+            return self._executor.submit(func, *args)
+        future = Future()
+        future.set_result(func(*args))
+        return future
+    
+    def _try_transfer(self, paths) -> Optional[Exception]:
+        """Transfère une image (source, destination) ; renvoie l'erreur au lieu de la lever"""
+        try:
+            self.transfer_file(*paths)
+            return None
+        except Exception as e:
+            return e
+    
     def copy_images_to_page(self, page_dir: Path, page_metadata: List[Dict[str, Any]], page_num: int) -> int:
         """
         Copie les fichiers images correspondants dans le répertoire de la page
@@ -182,34 +514,46 @@ class MetadataPaginator:
             Nombre de fichiers copiés avec succès
         """
         copied_count = 0
+        unnamed_count = 0
         missing_files = []
+        transfers = []
+        source_index = self._get_source_index()
         
         for metadata in page_metadata:
-            filename = metadata.get('Fichier', '')
+            try:
+                filename = _get_filename(metadata)
+            except (KeyError, TypeError):
+                filename = ''
             if not filename:
-                print(f"⚠️ Page {page_num}: Nom de fichier manquant dans les métadonnées")
+                unnamed_count += 1
                 continue
             
-            source_file = self.current_dir / filename
-            dest_file = page_dir / filename
-            
-            if source_file.exists():
-                try:
-                    shutil.copy2(source_file, dest_file)
-                    copied_count += 1
-                except Exception as e:
-                    print(f"❌ Erreur copie {filename}: {e}")
+            # Recherche directe dans l'index ; _find_source ne sert qu'aux chemins avec sous-dossier
+            source_path = source_index.get(filename) or self._find_source(filename)
+            if source_path is not None:
+                transfers.append((Path(source_path), page_dir / filename))
             else:
                 missing_files.append(filename)
         
+        # Transferts simultanés (les copies libèrent le GIL pendant les appels système) ;
+        # map() conserve l'ordre pour les messages d'erreur
+        mapper = self._executor.map if self._executor is not None else map
+        failures = []
+        for (source_file, _), error in zip(transfers, mapper(self._try_transfer, transfers)):
+            if error is None:
+                copied_count += 1
+            else:
+                failures.append(f"{source_file.name}: {error}")
+        
+        # Un message par page et par type de problème, pas un par image
+        if unnamed_count:
+            logger.warning("⚠️ Page %d: Nom de fichier manquant dans %d entrées des métadonnées", page_num, unnamed_count)
+        if failures:
+            logger.error("❌ Page %d: %d erreurs de copie:%s", page_num, len(failures), _format_sample(failures))
         if missing_files:
-            print(f"⚠️ Page {page_num}: {len(missing_files)} fichiers manquants:")
-            for missing in missing_files[:5]:  # Afficher seulement les 5 premiers
-                print(f"   - {missing}")
-            if len(missing_files) > 5:
-                print(f"   ... et {len(missing_files) - 5} autres")
+            logger.warning("⚠️ Page %d: %d fichiers manquants:%s", page_num, len(missing_files), _format_sample(missing_files))
         
-        print(f"📋 Page {page_num}: {copied_count}/{len(page_metadata)} fichiers copiés")
+        logger.info("📋 Page %d: %d/%d fichiers copiés", page_num, copied_count, len(page_metadata))
         return copied_count
     
     def paginate(self) -> bool:
@@ -226,45 +570,86 @@ class MetadataPaginator:
         if not self.find_metadata_file():
             return False
         
-        # 2. Charger les métadonnées
-        metadata_list = self.load_metadata()
-        if not metadata_list:
+        # 2. Lire les métadonnées en flux et traiter chaque page dès qu'elle est complète
+        #    (seule la page courante est gardée en mémoire). Les pages sont préparées dans un
+        #    répertoire de travail temporaire et ne remplacent les anciennes qu'une fois tout le
+        #    fichier lu : un metadata.json corrompu en cours de route ne laisse rien à moitié fait.
+        total_images = 0
+        total_copied = 0
+        success_count = 0
+        num_pages = 0
+        
+        # Index des fichiers du répertoire courant, reconstruit à chaque exécution
+        self._source_index = None
+        self._moved = [] if self.mode == "move" else None
+        staging_dir = self.current_dir / f".pagination.{uuid.uuid4().hex}"
+        
+        # Un seul groupe de threads pour les transferts de toutes les pages
+        if self.max_concurrency > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        # Suppression des anciens répertoires de pages en arrière-plan
+        self._cleanup_executor = ThreadPoolExecutor(max_workers=2)
+        
+        try:
+            try:
+                staging_dir.mkdir()
+                records = self._iter_metadata()
+                while True:
+                    page_metadata = list(itertools.islice(records, self.images_per_page))
+                    if not page_metadata:
+                        break
+                    num_pages += 1
+                    page_num = num_pages
+                    start_idx = total_images
+                    total_images += len(page_metadata)
+                    
+                    logger.info("\n📄 Traitement de la page %d...", page_num)
+                    logger.info("📄 Page %d: %d images (indices %d-%d)", page_num, len(page_metadata), start_idx, total_images - 1)
+                    page_dir = staging_dir / str(page_num)
+                    page_dir.mkdir()
+                    
+                    # Sauvegarder les métadonnées de la page en arrière-plan pendant la copie des images
+                    saved = self._submit(self.save_page_metadata, page_dir, page_metadata, page_num)
+                    total_copied += self.copy_images_to_page(page_dir, page_metadata, page_num)
+                    if saved.result():
+                        success_count += 1
+                    else:
+                        logger.error("❌ Échec du traitement de la page %d", page_num)
+            except JSON_ERRORS as e:
+                print(f"❌ Erreur de format JSON: {e}")
+                self._abort_staging(staging_dir)
+                return False
+            except Exception as e:
+                print(f"❌ Erreur lors du chargement: {e}")
+                self._abort_staging(staging_dir)
+                return False
+            
+            # Fichier entièrement lu : mise en place des pages, à la place des anciennes
+            for page_num in range(1, num_pages + 1):
+                self.install_page_directory(staging_dir / str(page_num), page_num)
+            staging_dir.rmdir()
+        except OSError as e:
+            print(f"❌ Erreur lors de la mise en place des pages: {e} (pages restantes dans {staging_dir})")
             return False
+        finally:
+            self._moved = None
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._cleanup_executor.shutdown()
+            self._cleanup_executor = None
         
-        # 3. Calculer le nombre de pages
-        num_pages = self.calculate_pages(len(metadata_list))
         if num_pages == 0:
             print("❌ Aucune page à créer")
             return False
         
-        # 4. Créer les répertoires de pages
-        page_dirs = self.create_page_directories(num_pages)
-        
-        # 5. Diviser les métadonnées par pages
-        pages_metadata = self.split_metadata_by_pages(metadata_list, num_pages)
-        
-        # 6. Traiter chaque page
-        total_copied = 0
-        success_count = 0
-        
-        for page_num, (page_dir, page_metadata) in enumerate(zip(page_dirs, pages_metadata), 1):
-            print(f"\n📄 Traitement de la page {page_num}...")
-            
-            # Sauvegarder les métadonnées de la page
-            if self.save_page_metadata(page_dir, page_metadata, page_num):
-                # Copier les fichiers images
-                copied = self.copy_images_to_page(page_dir, page_metadata, page_num)
-                total_copied += copied
-                success_count += 1
-            else:
-                print(f"❌ Échec du traitement de la page {page_num}")
-        
-        # 7. Résumé final
+        # 3. Résumé final
         print("\n" + "=" * 50)
         print("📊 RÉSUMÉ DE LA PAGINATION")
+        print(f"📊 {total_images} images trouvées dans metadata.json")
         print(f"✅ Pages créées avec succès: {success_count}/{num_pages}")
         print(f"📁 Répertoires créés: {', '.join([str(i) for i in range(1, num_pages + 1)])}")
-        print(f"📋 Total d'images copiées: {total_copied}/{len(metadata_list)}")
+        print(f"📋 Total d'images copiées: {total_copied}/{total_images}")
         print(f"📄 Images par page: {self.images_per_page} (maximum)")
         
         if success_count == num_pages:
@@ -278,12 +663,27 @@ def main():
     """
     Fonction principale du script
     """
+    parser = argparse.ArgumentParser(description="Divise le metadata.json du répertoire courant en pages de 30 images")
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help="N'affiche pas le détail de chaque page (seulement les erreurs et le résumé)"
+    )
+    parser.add_argument(
+        '--mode',
+        choices=TRANSFER_MODES,
+        default='copy',
+        help="Placement des images dans les pages : copy (défaut), hardlink, symlink ou move"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR if args.quiet else logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("📚 Paginateur de Métadonnées d'Images")
     print("Divise un fichier metadata.json en pages de 30 images maximum")
     print()
     
     # Créer et exécuter le paginateur
-    paginator = MetadataPaginator(images_per_page=30)
+    paginator = MetadataPaginator(images_per_page=30, mode=args.mode)
     success = paginator.paginate()
     
     if success:
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Script de test pour metadata_manager.py
+Tests pytest pour metadata_manager.py
 
-Ce script teste les fonctionnalités d'extraction et d'application de métadonnées.
+Ce module teste les fonctionnalités d'extraction et d'application de métadonnées.
+Il peut être lancé avec pytest ou directement (python test_metadata_manager.py).
 
 Auteur: Geoffroy Streit / Hylst
 Date: 2024
@@ -12,283 +13,218 @@ Date: 2024
 import os
 import sys
 import json
-import tempfile
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import pytest
+
+try:
+    import orjson  # Optionnel: sérialisation JSON beaucoup plus rapide
+except ImportError:
+    orjson = None
+
 # Ajouter le répertoire parent au path pour importer metadata_manager
 sys.path.insert(0, str(Path(__file__).parent))
 
 from metadata_manager import MetadataManager
 
-def test_extraction():
-    """Test de l'extraction de métadonnées"""
-    print("🔍 Test d'extraction de métadonnées...")
+def dump_json(data, path):
+    """Écrit un fichier JSON indenté en UTF-8 (orjson si disponible)"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+# Répertoire des images de référence (jamais modifiées par les tests)
+IMGS_DIR = (Path(__file__).parent.parent / "imgs").resolve()
+# Nombre d'images de imgs/ copiées une seule fois pour toute la session de tests
+SESSION_IMAGE_COUNT = 2
+# En dessous de ce nombre d'images, la vérification lit les titres sans pool de processus
+VERIFY_POOL_THRESHOLD = 8
+
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+
+# Champs communs à toutes les métadonnées de test (copiés en bloc dans chaque entrée)
+TEST_METADATA_TEMPLATE = {
+    "Taille": "Test",
+    "Type": "image/jpeg",
+    "Largeur": 1920,
+    "Hauteur": 1080,
+    "Categorie": "Test Category",
+    "Categorie secondaire": "Test Subcategory",
+    "Createur": "Test Creator",
+}
+
+def find_jpgs(directory, limit=None):
+    """
+    Liste les images JPEG d'un répertoire (extension insensible à la casse)
     
-    # Utiliser le répertoire imgs existant
-    imgs_dir = Path(__file__).parent.parent / "imgs"
+    Un seul parcours os.scandir, interrompu dès que `limit` images sont trouvées.
     
-    if not imgs_dir.exists():
-        print(f"❌ Répertoire d'images non trouvé: {imgs_dir}")
-        return False
+    Args:
+        directory: Répertoire à parcourir
+        limit: Nombre maximal d'images à retourner (None = toutes)
+        
+    Returns:
+        Chemins des images, dans l'ordre du répertoire
+    """
+    found = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(JPEG_EXTENSIONS):
+                found.append(Path(entry.path))
+                if len(found) == limit:
+                    break
+    return found
+
+def iter_test_metadata(images):
+    """
+    Génère des métadonnées de test synthétiques, une entrée par image
     
-    # Créer un fichier de sortie temporaire
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-        temp_json = temp_file.name
+    Args:
+        images: Chemins des images
+        
+    Yields:
+        Dictionnaire de métadonnées au format du JSON d'extraction
+    """
+    for i, img_path in enumerate(images, 1):
+        yield {
+            "Fichier": img_path.name,
+            **TEST_METADATA_TEMPLATE,
+            "Description": f"Description de test pour l'image {i}",
+            "Mots cles": ["test", "metadata", f"image{i}", "automatique"],
+            "Titre": f"Titre de test {i}",
+            "Caracteristiques": ["test", "metadata", f"image{i}"],
+            "Perception": f"Perception artistique de test pour l'image {i}",
+            "Conte": f"Histoire imaginaire pour l'image {i}"
+        }
+
+@pytest.fixture(scope="session")
+def manager():
+    """Gestionnaire partagé par tous les tests (créé une seule fois)"""
+    return MetadataManager(verbose=True)
+
+@pytest.fixture(scope="session")
+def shared_imgs_dir(tmp_path_factory):
+    """
+    Copie de référence des images de test, faite une seule fois pour la session
+    
+    Les tests ne modifient jamais ce répertoire (voir `work_dir`) ; pytest le supprime
+    avec ses autres répertoires temporaires.
+    
+    Returns:
+        Chemin du répertoire contenant les copies
+    """
+    if not IMGS_DIR.is_dir():
+        pytest.skip(f"Répertoire d'images non trouvé: {IMGS_DIR}")
+    images = find_jpgs(IMGS_DIR, SESSION_IMAGE_COUNT)
+    if not images:
+        pytest.skip("Aucune image JPG trouvée pour le test")
+    
+    shared_dir = tmp_path_factory.mktemp("imgs")
+    for img in images:
+        shutil.copy2(img, shared_dir / img.name)
+    return shared_dir
+
+@pytest.fixture
+def work_dir(shared_imgs_dir, tmp_path):
+    """
+    Copie des images propre à chaque test : les tests qui écrivent des métadonnées
+    ne dépendent ni de l'ordre d'exécution ni des autres tests
+    
+    Returns:
+        Chemin du répertoire de travail du test
+    """
+    images_dir = tmp_path / "images"
+    shutil.copytree(shared_imgs_dir, images_dir)
+    return images_dir
+
+def read_xmp_title(image_path):
+    """
+    Lit le titre XMP d'une image (exécutée dans un processus de vérification)
     
+    Returns:
+        Tuple (titre ou None, message d'erreur ou None)
+    """
     try:
-        # Créer le gestionnaire et extraire
-        manager = MetadataManager(verbose=True)
-        success = manager.extract_metadata_from_directory(str(imgs_dir), temp_json)
-        
-        if not success:
-            print("❌ Échec de l'extraction")
-            return False
-        
-        # Vérifier le contenu du fichier JSON
-        with open(temp_json, 'r', encoding='utf-8') as f:
-            metadata_list = json.load(f)
-        
-        if not isinstance(metadata_list, list) or len(metadata_list) == 0:
-            print("❌ Fichier JSON vide ou invalide")
-            return False
-        
-        print(f"✅ Extraction réussie: {len(metadata_list)} images traitées")
-        
-        # Afficher un exemple
-        if metadata_list:
-            example = metadata_list[0]
-            print(f"📄 Exemple - Fichier: {example.get('Fichier', 'N/A')}")
-            print(f"📄 Titre: {example.get('Titre', 'N/A')}")
-            print(f"📄 Mots-clés: {len(example.get('Mots cles', []))} mots-clés")
-        
-        return True
-        
+        import pyexiv2
+        with pyexiv2.Image(image_path) as img:
+            return img.read_xmp().get('Xmp.dc.title'), None
     except Exception as e:
-        print(f"❌ Erreur lors du test d'extraction: {str(e)}")
-        return False
-    
-    finally:
-        # Nettoyer le fichier temporaire
-        if os.path.exists(temp_json):
-            os.unlink(temp_json)
+        return None, str(e)
 
-def test_application():
-    """Test de l'application de métadonnées"""
-    print("\n📝 Test d'application de métadonnées...")
-    
-    # Créer un répertoire temporaire avec une copie d'image
-    imgs_dir = Path(__file__).parent.parent / "imgs"
+def test_extraction(manager, shared_imgs_dir, tmp_path):
+    """Test de l'extraction de métadonnées"""
+    output_json = tmp_path / "extraction.json"
     
-    if not imgs_dir.exists():
-        print(f"❌ Répertoire d'images non trouvé: {imgs_dir}")
-        return False
+    assert manager.extract_metadata_from_directory(str(shared_imgs_dir), str(output_json)), "Échec de l'extraction"
     
-    # Trouver une image de test
-    test_images = list(imgs_dir.glob("*.jpg"))[:2]  # Prendre 2 images pour le test
+    # Vérifier le contenu du fichier JSON
+    with open(output_json, 'r', encoding='utf-8') as f:
+        metadata_list = json.load(f)
     
-    if not test_images:
-        print("❌ Aucune image JPG trouvée pour le test")
-        return False
+    assert isinstance(metadata_list, list) and metadata_list, "Fichier JSON vide ou invalide"
+    assert {entry['Fichier'] for entry in metadata_list} == {img.name for img in find_jpgs(shared_imgs_dir)}
     
-    # Créer un répertoire temporaire
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Copier les images de test
-        copied_images = []
-        for img in test_images:
-            dest = temp_path / img.name
-            shutil.copy2(img, dest)
-            copied_images.append(dest)
-        
-        # Créer des métadonnées de test
-        test_metadata = []
-        for i, img_path in enumerate(copied_images):
-            metadata = {
-                "Fichier": img_path.name,
-                "Taille": "Test",
-                "Type": "image/jpeg",
-                "Largeur": 1920,
-                "Hauteur": 1080,
-                "Categorie": "Test Category",
-                "Categorie secondaire": "Test Subcategory",
-                "Createur": "Test Creator",
-                "Description": f"Description de test pour l'image {i+1}",
-                "Mots cles": ["test", "metadata", f"image{i+1}", "automatique"],
-                "Titre": f"Titre de test {i+1}",
-                "Caracteristiques": ["test", "metadata", f"image{i+1}"],
-                "Perception": f"Perception artistique de test pour l'image {i+1}",
-                "Conte": f"Histoire imaginaire pour l'image {i+1}"
-            }
-            test_metadata.append(metadata)
-        
-        # Sauvegarder le JSON de test
-        test_json = temp_path / "test_metadata.json"
-        with open(test_json, 'w', encoding='utf-8') as f:
-            json.dump(test_metadata, f, ensure_ascii=False, indent=2)
-        
-        try:
-            # Appliquer les métadonnées
-            manager = MetadataManager(verbose=True)
-            success = manager.apply_metadata_from_json(str(test_json), str(temp_path))
-            
-            if not success:
-                print("❌ Échec de l'application des métadonnées")
-                return False
-            
-            print(f"✅ Application réussie sur {len(copied_images)} images")
-            
-            # Vérifier que les métadonnées ont été appliquées
-            verification_success = True
-            for img_path in copied_images:
-                try:
-                    import pyexiv2
-                    with pyexiv2.Image(str(img_path)) as img:
-                        xmp_data = img.read_xmp()
-                        if 'Xmp.dc.title' in xmp_data:
-                            print(f"✅ Métadonnées vérifiées pour {img_path.name}")
-                        else:
-                            print(f"⚠️ Métadonnées non trouvées pour {img_path.name}")
-                            verification_success = False
-                except Exception as e:
-                    print(f"⚠️ Erreur vérification {img_path.name}: {str(e)}")
-                    verification_success = False
-            
-            return verification_success
-            
-        except Exception as e:
-            print(f"❌ Erreur lors du test d'application: {str(e)}")
-            return False
+    example = metadata_list[0]
+    print(f"📄 Exemple - Fichier: {example.get('Fichier', 'N/A')}")
+    print(f"📄 Titre: {example.get('Titre', 'N/A')}")
+    print(f"📄 Mots-clés: {len(example.get('Mots cles', []))} mots-clés")
 
-def test_round_trip():
-    """Test complet: extraction puis application"""
-    print("\n🔄 Test complet (extraction + application)...")
-    
-    imgs_dir = Path(__file__).parent.parent / "imgs"
+def test_application(manager, work_dir, tmp_path):
+    """Test de l'application de métadonnées"""
+    copied_images = sorted(find_jpgs(work_dir))
     
-    if not imgs_dir.exists():
-        print(f"❌ Répertoire d'images non trouvé: {imgs_dir}")
-        return False
+    # Créer et sauvegarder des métadonnées de test (hors du répertoire des images)
+    test_metadata = list(iter_test_metadata(copied_images))
+    test_json = tmp_path / "test_metadata.json"
+    dump_json(test_metadata, test_json)
     
-    # Prendre une image pour le test
-    test_images = list(imgs_dir.glob("*.jpg"))[:1]
+    assert manager.apply_metadata_from_json(str(test_json), str(work_dir)), "Échec de l'application des métadonnées"
     
-    if not test_images:
-        print("❌ Aucune image JPG trouvée pour le test")
-        return False
+    # Vérifier que les métadonnées ont été appliquées (lectures réparties sur plusieurs
+    # processus seulement pour un lot assez grand pour amortir leur démarrage)
+    paths = [str(p) for p in copied_images]
+    workers = min(len(paths), os.cpu_count() or 1)
+    if len(paths) < VERIFY_POOL_THRESHOLD or workers < 2:
+        results = [read_xmp_title(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read_xmp_title, paths))
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Copier l'image de test
-        test_img = test_images[0]
-        copied_img = temp_path / test_img.name
-        shutil.copy2(test_img, copied_img)
-        
-        try:
-            manager = MetadataManager(verbose=True)
-            
-            # 1. Extraire les métadonnées existantes
-            extracted_json = temp_path / "extracted.json"
-            success1 = manager.extract_metadata_from_directory(str(temp_path), str(extracted_json))
-            
-            if not success1:
-                print("❌ Échec de l'extraction")
-                return False
-            
-            # 2. Modifier légèrement les métadonnées
-            with open(extracted_json, 'r', encoding='utf-8') as f:
-                metadata_list = json.load(f)
-            
-            if metadata_list:
-                # Forcer un titre complètement différent
-                metadata_list[0]['Titre'] = "TEST ROUND-TRIP MODIFIÉ"
-                metadata_list[0]['Mots cles'] = ["test", "round-trip", "metadata"]
-                metadata_list[0]['Description'] = "Description modifiée par le test round-trip"
-            
-            modified_json = temp_path / "modified.json"
-            with open(modified_json, 'w', encoding='utf-8') as f:
-                json.dump(metadata_list, f, ensure_ascii=False, indent=2)
-            
-            # 3. Appliquer les métadonnées modifiées
-            success2 = manager.apply_metadata_from_json(str(modified_json), str(temp_path))
-            
-            if not success2:
-                print("❌ Échec de l'application")
-                return False
-            
-            # 4. Vérifier les modifications
-            try:
-                import pyexiv2
-                with pyexiv2.Image(str(copied_img)) as img:
-                    xmp_data = img.read_xmp()
-                    title = xmp_data.get('Xmp.dc.title', {})
-                    if isinstance(title, dict) and 'lang="x-default"' in title:
-                        actual_title = title['lang="x-default"']
-                        if "TEST ROUND-TRIP MODIFIÉ" in actual_title:
-                            print("✅ Test round-trip réussi: modifications appliquées")
-                            return True
-                        else:
-                            print(f"⚠️ Titre attendu non trouvé. Titre actuel: {actual_title}")
-                    elif isinstance(title, str):
-                        if "TEST ROUND-TRIP MODIFIÉ" in title:
-                            print("✅ Test round-trip réussi: modifications appliquées")
-                            return True
-                        else:
-                            print(f"⚠️ Titre attendu non trouvé. Titre actuel: {title}")
-                    else:
-                        print(f"⚠️ Format de titre inattendu: {title}")
-            except Exception as e:
-                print(f"⚠️ Erreur vérification finale: {str(e)}")
-            
-            return False
-            
-        except Exception as e:
-            print(f"❌ Erreur lors du test round-trip: {str(e)}")
-            return False
+    for img_path, expected, (title, error) in zip(copied_images, test_metadata, results):
+        assert error is None, f"Erreur vérification {img_path.name}: {error}"
+        assert title is not None, f"Métadonnées non trouvées pour {img_path.name}"
+        assert expected['Titre'] in str(title)
+
+def test_round_trip(manager, work_dir):
+    """Test complet: extraction puis application"""
+    # 1. Extraire les métadonnées existantes (en mémoire, sans fichier JSON intermédiaire)
+    metadata_list = manager.extract_metadata(str(work_dir))
+    assert metadata_list, "Échec de l'extraction"
+    
+    # 2. Modifier légèrement les métadonnées
+    # Forcer un titre complètement différent
+    metadata_list[0]['Titre'] = "TEST ROUND-TRIP MODIFIÉ"
+    metadata_list[0]['Mots cles'] = ["test", "round-trip", "metadata"]
+    metadata_list[0]['Description'] = "Description modifiée par le test round-trip"
+    
+    # 3. Appliquer les métadonnées modifiées
+    assert manager.apply_metadata(metadata_list, str(work_dir)), "Échec de l'application"
+    
+    # 4. Vérifier les modifications
+    title, error = read_xmp_title(str(work_dir / metadata_list[0]['Fichier']))
+    assert error is None, f"Erreur vérification finale: {error}"
+    if isinstance(title, dict):
+        title = title.get('lang="x-default"')
+    assert isinstance(title, str), f"Format de titre inattendu: {title}"
+    assert "TEST ROUND-TRIP MODIFIÉ" in title, f"Titre attendu non trouvé. Titre actuel: {title}"
 
 def main():
-    """Fonction principale de test"""
-    print("🧪 Tests du gestionnaire de métadonnées")
-    print("=" * 50)
-    
-    tests = [
-        ("Extraction", test_extraction),
-        ("Application", test_application),
-        ("Round-trip", test_round_trip)
-    ]
-    
-    results = []
-    
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ Erreur critique dans {test_name}: {str(e)}")
-            results.append((test_name, False))
-    
-    # Résumé des résultats
-    print("\n" + "=" * 50)
-    print("📊 Résumé des tests:")
-    
-    success_count = 0
-    for test_name, success in results:
-        status = "✅ RÉUSSI" if success else "❌ ÉCHEC"
-        print(f"  {test_name}: {status}")
-        if success:
-            success_count += 1
-    
-    print(f"\n🎯 Score: {success_count}/{len(results)} tests réussis")
-    
-    if success_count == len(results):
-        print("🎉 Tous les tests sont passés avec succès!")
-        return True
-    else:
-        print("⚠️ Certains tests ont échoué")
-        return False
+    """Lance les tests de ce fichier avec pytest (arguments supplémentaires transmis)"""
+    return pytest.main([__file__, *sys.argv[1:]])
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(main())
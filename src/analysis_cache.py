@@ -0,0 +1,93 @@
+"""On-disk cache of image analysis results for the Image Auto-Tagger application.
+
+This module stores the metadata generated for an image (Vision + Gemini)
+under a content-addressed key, so re-running on unchanged pixels skips
+the API calls entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+try:
+    from blake3 import blake3 as _new_hash  # Optional SIMD-accelerated hash
+except ImportError:
+    def _new_hash(data: bytes = b""):
+        """Fallback 256-bit hash from the standard library."""
+        return hashlib.blake2b(data, digest_size=32)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = ".vision_cache"
+
+def make_cache_key(image_bytes: bytes, *parts: Iterable[str]) -> str:
+    """Build a content-addressed cache key.
+
+    Args:
+        image_bytes: The image payload sent to the APIs
+        *parts: Extra components the result depends on (features, language, model...)
+
+    Returns:
+        Hex digest identifying the (content, parameters) pair
+    """
+    digest = _new_hash(image_bytes)
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """Content-addressed JSON cache stored as one file per entry."""
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries (created if needed)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        """Get the file path of a cache entry."""
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached entry.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            The cached dictionary, or None on miss or unreadable entry
+        """
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store an entry atomically (safe with concurrent workers).
+
+        Args:
+            key: Cache key from make_cache_key
+            value: JSON-serializable dictionary
+        """
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(temp_path, self._entry_path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Failed to write cache entry {key}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
@@ -4,16 +4,46 @@ This module provides centralized configuration management with support for
 environment variables, validation, and default values.
 """
 
+import copy
+import functools
 import os
+import sys
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Optional, Tuple
+from dataclasses import asdict, dataclass, field, fields
+
+try:
+    import orjson  # Optional C JSON parser/serializer
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Config sections use __slots__ where dataclasses support it (Python 3.10+):
+# smaller instances and direct attribute access
+_config_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+def _loads_json(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a config file once per version (path, modification time and size)."""
+    with open(path, 'rb') as f:
+        return _loads_json(f.read())
+
+def _dumps_json(data: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+@_config_dataclass
 class APIConfig:
     """Configuration for API settings."""
     default_api: str = "vision"
@@ -24,7 +54,7 @@ class APIConfig:
     gemini_temperature: float = 0.7
     vision_max_results: int = 50
 
-@dataclass
+@_config_dataclass
 class ProcessingConfig:
     """Configuration for image processing settings."""
     max_workers: int = 4
@@ -33,7 +63,7 @@ class ProcessingConfig:
     backup_enabled: bool = False
     rename_files: bool = True
 
-@dataclass
+@_config_dataclass
 class OutputConfig:
     """Configuration for output settings."""
     default_language: str = "fr"
@@ -42,7 +72,7 @@ class OutputConfig:
     pretty_print: bool = True
     timestamp_format: str = "%Y%m%d_%H%M%S"
 
-@dataclass
+@_config_dataclass
 class LoggingConfig:
     """Configuration for logging settings."""
     level: str = "INFO"
@@ -50,7 +80,7 @@ class LoggingConfig:
     enable_rich_tracebacks: bool = True
     log_file: Optional[str] = None
 
-@dataclass
+@_config_dataclass
 class AppConfig:
     """Main application configuration."""
     api: APIConfig = field(default_factory=APIConfig)
@@ -58,6 +88,32 @@ class AppConfig:
     output: OutputConfig = field(default_factory=OutputConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
 
+# Known keys of each configuration section, derived from the dataclass fields
+_SECTION_FIELDS: Dict[str, frozenset] = {
+    section.name: frozenset(f.name for f in fields(section.type))
+    for section in fields(AppConfig)
+}
+
+# Environment variable overrides: (variable, config section, attribute, converter)
+_ENV_OVERRIDES: Tuple[Tuple[str, str, str, Callable[[str], Any]], ...] = (
+    ('IMG_TAGGER_API', 'api', 'default_api', str),
+    ('IMG_TAGGER_WORKERS', 'processing', 'max_workers', int),
+    ('IMG_TAGGER_LANGUAGE', 'output', 'default_language', str),
+    ('IMG_TAGGER_LOG_LEVEL', 'logging', 'level', str),
+    ('IMG_TAGGER_RETRY_COUNT', 'api', 'retry_count', int),
+    ('IMG_TAGGER_TIMEOUT', 'api', 'timeout', int),
+)
+
+# Accepted values and lower bounds checked by ConfigManager._validate_config
+_VALID_APIS = frozenset({'vision', 'gemini'})
+_VALID_LANGUAGES = frozenset({'fr', 'en'})
+_MINIMUM_VALUES: Tuple[Tuple[str, str, int, str], ...] = (
+    ('api', 'retry_count', 1, "Retry count must be at least 1"),
+    ('api', 'timeout', 1, "Timeout must be at least 1 second"),
+    ('processing', 'max_workers', 1, "Max workers must be at least 1"),
+    ('processing', 'max_file_size_mb', 1, "Max file size must be at least 1 MB"),
+)
+
 class ConfigManager:
     """Manages application configuration with environment variable support."""
     
@@ -75,40 +131,31 @@ class ConfigManager:
     
     def _load_config(self) -> None:
         """Load configuration from file if it exists."""
-        if self.config_file and self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                self._update_config_from_dict(config_data)
-                logger.info(f"Configuration loaded from {self.config_file}")
-            except Exception as e:
-                logger.warning(f"Failed to load config file {self.config_file}: {e}")
+        if not self.config_file:
+            return
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return
+        try:
+            # Cached data is shared across instances: each manager gets its own copy
+            config_data = copy.deepcopy(_read_config_file(
+                os.path.abspath(self.config_file), stat.st_mtime_ns, stat.st_size))
+            self._update_config_from_dict(config_data)
+            logger.info(f"Configuration loaded from {self.config_file}")
+        except Exception as e:
+            logger.warning(f"Failed to load config file {self.config_file}: {e}")
     
     def _update_config_from_dict(self, config_data: Dict[str, Any]) -> None:
         """Update configuration from dictionary data."""
-        if 'api' in config_data:
-            api_data = config_data['api']
-            for key, value in api_data.items():
-                if hasattr(self._config.api, key):
-                    setattr(self._config.api, key, value)
-        
-        if 'processing' in config_data:
-            proc_data = config_data['processing']
-            for key, value in proc_data.items():
-                if hasattr(self._config.processing, key):
-                    setattr(self._config.processing, key, value)
-        
-        if 'output' in config_data:
-            output_data = config_data['output']
-            for key, value in output_data.items():
-                if hasattr(self._config.output, key):
-                    setattr(self._config.output, key, value)
-        
-        if 'logging' in config_data:
-            log_data = config_data['logging']
-            for key, value in log_data.items():
-                if hasattr(self._config.logging, key):
-                    setattr(self._config.logging, key, value)
+        for section_name, section_data in config_data.items():
+            valid_keys = _SECTION_FIELDS.get(section_name)
+            if valid_keys is None:
+                continue
+            section = getattr(self._config, section_name)
+            for key, value in section_data.items():
+                if key in valid_keys:
+                    setattr(section, key, value)
     
     def _apply_env_overrides(self) -> None:
         """Apply environment variable overrides."""
@@ -120,23 +167,12 @@ class ConfigManager:
             logger.info("Google credentials found in environment")
         
         # Override specific settings from environment
-        env_mappings = {
-            'IMG_TAGGER_API': ('api', 'default_api'),
-            'IMG_TAGGER_WORKERS': ('processing', 'max_workers', int),
-            'IMG_TAGGER_LANGUAGE': ('output', 'default_language'),
-            'IMG_TAGGER_LOG_LEVEL': ('logging', 'level'),
-            'IMG_TAGGER_RETRY_COUNT': ('api', 'retry_count', int),
-            'IMG_TAGGER_TIMEOUT': ('api', 'timeout', int),
-        }
-        
-        for env_var, config_path in env_mappings.items():
-            value = os.getenv(env_var)
+        environ = os.environ
+        for env_var, section_name, attr_name, converter in _ENV_OVERRIDES:
+            value = environ.get(env_var)
             if value:
-                section = getattr(self._config, config_path[0])
-                attr_name = config_path[1]
-                converter = config_path[2] if len(config_path) > 2 else str
                 try:
-                    setattr(section, attr_name, converter(value))
+                    setattr(getattr(self._config, section_name), attr_name, converter(value))
                     logger.debug(f"Applied environment override: {env_var}={value}")
                 except (ValueError, TypeError) as e:
                     logger.warning(f"Invalid environment value for {env_var}: {value} ({e})")
@@ -144,24 +180,16 @@ class ConfigManager:
     def _validate_config(self) -> None:
         """Validate configuration values."""
         # Validate API settings
-        if self._config.api.default_api not in ['vision', 'gemini']:
+        if self._config.api.default_api not in _VALID_APIS:
             raise ValueError(f"Invalid default API: {self._config.api.default_api}")
         
-        if self._config.api.retry_count < 1:
-            raise ValueError("Retry count must be at least 1")
-        
-        if self._config.api.timeout < 1:
-            raise ValueError("Timeout must be at least 1 second")
-        
-        # Validate processing settings
-        if self._config.processing.max_workers < 1:
-            raise ValueError("Max workers must be at least 1")
-        
-        if self._config.processing.max_file_size_mb < 1:
-            raise ValueError("Max file size must be at least 1 MB")
+        # Validate numeric lower bounds
+        for section_name, attr_name, minimum, message in _MINIMUM_VALUES:
+            if getattr(getattr(self._config, section_name), attr_name) < minimum:
+                raise ValueError(message)
         
         # Validate output settings
-        if self._config.output.default_language not in ['fr', 'en']:
+        if self._config.output.default_language not in _VALID_LANGUAGES:
             raise ValueError(f"Unsupported language: {self._config.output.default_language}")
         
         logger.debug("Configuration validation passed")
@@ -172,47 +200,35 @@ class ConfigManager:
     
     def save_config(self, output_file: Path) -> None:
         """Save current configuration to file."""
-        config_dict = {
-            'api': {
-                'default_api': self._config.api.default_api,
-                'retry_count': self._config.api.retry_count,
-                'retry_delay': self._config.api.retry_delay,
-                'timeout': self._config.api.timeout,
-                'gemini_model': self._config.api.gemini_model,
-                'gemini_temperature': self._config.api.gemini_temperature,
-                'vision_max_results': self._config.api.vision_max_results,
-            },
-            'processing': {
-                'max_workers': self._config.processing.max_workers,
-                'supported_formats': self._config.processing.supported_formats,
-                'max_file_size_mb': self._config.processing.max_file_size_mb,
-                'backup_enabled': self._config.processing.backup_enabled,
-                'rename_files': self._config.processing.rename_files,
-            },
-            'output': {
-                'default_language': self._config.output.default_language,
-                'output_format': self._config.output.output_format,
-                'include_raw_data': self._config.output.include_raw_data,
-                'pretty_print': self._config.output.pretty_print,
-                'timestamp_format': self._config.output.timestamp_format,
-            },
-            'logging': {
-                'level': self._config.logging.level,
-                'format': self._config.logging.format,
-                'enable_rich_tracebacks': self._config.logging.enable_rich_tracebacks,
-                'log_file': self._config.logging.log_file,
-            }
-        }
+        config_dict = asdict(self._config)
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(config_dict, f, indent=2, ensure_ascii=False)
+            Path(output_file).write_bytes(_dumps_json(config_dict))
             logger.info(f"Configuration saved to {output_file}")
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
             raise
 
+# Shared default manager and the (config file version, environment overrides) it was built from
+_default_manager: Optional[ConfigManager] = None
+_default_manager_key: Optional[tuple] = None
+
 def get_default_config_manager() -> ConfigManager:
-    """Get a default configuration manager instance."""
+    """Get the default configuration manager instance.
+    
+    The same instance is returned to every caller until the config file or
+    one of the environment overrides changes.
+    """
+    global _default_manager, _default_manager_key
     config_file = Path("config/app_config.json")
-    return ConfigManager(config_file if config_file.exists() else None)
\ No newline at end of file
+    try:
+        stat = config_file.stat()
+        file_key = (os.path.abspath(config_file), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    environ = os.environ
+    key = (file_key, tuple(environ.get(env_var) for env_var, _, _, _ in _ENV_OVERRIDES))
+    if _default_manager is None or key != _default_manager_key:
+        _default_manager = ConfigManager(config_file if file_key is not None else None)
+        _default_manager_key = key
+    return _default_manager
\ No newline at end of file
@@ -4,9 +4,13 @@ This module defines specific exception types to improve error handling
 and debugging throughout the application.
 """
 
+import copyreg
+
 class ImageTaggerError(Exception):
     """Base exception class for all Image Tagger errors."""
     
+    __slots__ = ('message', 'error_code', 'details')
+    
     def __init__(self, message: str, error_code: str = None, details: dict = None):
         """Initialize the exception.
         
@@ -18,8 +22,23 @@ class ImageTaggerError(Exception):
         super().__init__(message)
         self.message = message
         self.error_code = error_code or self.__class__.__name__
+        # Always a dict (never None): subclasses add their keys without re-checking
         self.details = details or {}
     
+    def __reduce__(self):
+        """Pickle slot attributes too (exceptions raised in worker processes).
+        
+        The instance is rebuilt without calling __init__, so subclasses with
+        required keyword arguments (e.g. APIError's api_name) round-trip as well.
+        Instance __dict__ entries (e.g. __notes__ from add_note) are kept.
+        """
+        state = dict(getattr(self, '__dict__', None) or {})
+        state.update((name, getattr(self, name))
+                     for cls in type(self).__mro__
+                     for name in cls.__dict__.get('__slots__', ())
+                     if hasattr(self, name))
+        return (copyreg.__newobj__, (self.__class__, *self.args), state)
+    
     def to_dict(self) -> dict:
         """Convert exception to dictionary for JSON serialization."""
         return {
@@ -31,15 +50,17 @@ class ImageTaggerError(Exception):
 
 class ConfigurationError(ImageTaggerError):
     """Raised when there's an issue with application configuration."""
-    pass
+    __slots__ = ()
 
 class CredentialsError(ImageTaggerError):
     """Raised when there's an issue with API credentials."""
-    pass
+    __slots__ = ()
 
 class APIError(ImageTaggerError):
     """Base class for API-related errors."""
     
+    __slots__ = ('api_name', 'status_code')
+    
     def __init__(self, message: str, api_name: str, status_code: int = None, **kwargs):
         """Initialize API error.
         
@@ -52,28 +73,30 @@ class APIError(ImageTaggerError):
         super().__init__(message, **kwargs)
         self.api_name = api_name
         self.status_code = status_code
-        if not self.details:
-            self.details = {}
-        self.details.update({
-            'api_name': api_name,
-            'status_code': status_code
-        })
+        self.details['api_name'] = api_name
+        self.details['status_code'] = status_code
 
 class VisionAPIError(APIError):
     """Raised when Google Vision API encounters an error."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, **kwargs):
         super().__init__(message, api_name='vision', **kwargs)
 
 class GeminiAPIError(APIError):
     """Raised when Gemini API encounters an error."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str, **kwargs):
         super().__init__(message, api_name='gemini', **kwargs)
 
 class RateLimitError(APIError):
     """Raised when API rate limits are exceeded."""
     
+    __slots__ = ('retry_after',)
+    
     def __init__(self, message: str, api_name: str, retry_after: int = None, **kwargs):
         """Initialize rate limit error.
         
@@ -89,15 +112,17 @@ class RateLimitError(APIError):
 
 class QuotaExceededError(APIError):
     """Raised when API quota is exceeded."""
-    pass
+    __slots__ = ()
 
 class AuthenticationError(APIError):
     """Raised when API authentication fails."""
-    pass
+    __slots__ = ()
 
 class ValidationError(ImageTaggerError):
     """Raised when input validation fails."""
     
+    __slots__ = ('field_name', 'field_value')
+    
     def __init__(self, message: str, field_name: str = None, field_value = None, **kwargs):
         """Initialize validation error.
         
@@ -110,16 +135,14 @@ class ValidationError(ImageTaggerError):
         super().__init__(message, **kwargs)
         self.field_name = field_name
         self.field_value = field_value
-        if not self.details:
-            self.details = {}
-        self.details.update({
-            'field_name': field_name,
-            'field_value': str(field_value) if field_value is not None else None
-        })
+        self.details['field_name'] = field_name
+        self.details['field_value'] = str(field_value) if field_value is not None else None
 
 class FileProcessingError(ImageTaggerError):
     """Raised when there's an error processing a file."""
     
+    __slots__ = ('file_path',)
+    
     def __init__(self, message: str, file_path: str = None, **kwargs):
         """Initialize file processing error.
         
@@ -130,17 +153,17 @@ class FileProcessingError(ImageTaggerError):
         """
         super().__init__(message, **kwargs)
         self.file_path = file_path
-        if not self.details:
-            self.details = {}
         self.details['file_path'] = file_path
 
 class UnsupportedFormatError(FileProcessingError):
     """Raised when an unsupported file format is encountered."""
-    pass
+    __slots__ = ()
 
 class FileSizeError(FileProcessingError):
     """Raised when a file is too large to process."""
     
+    __slots__ = ('file_size', 'max_size')
+    
     def __init__(self, message: str, file_path: str = None, file_size: int = None, max_size: int = None, **kwargs):
         """Initialize file size error.
         
@@ -154,14 +177,14 @@ class FileSizeError(FileProcessingError):
         super().__init__(message, file_path, **kwargs)
         self.file_size = file_size
         self.max_size = max_size
-        self.details.update({
-            'file_size': file_size,
-            'max_size': max_size
-        })
+        self.details['file_size'] = file_size
+        self.details['max_size'] = max_size
 
 class JSONParsingError(ImageTaggerError):
     """Raised when JSON parsing fails."""
     
+    __slots__ = ('raw_content',)
+    
     def __init__(self, message: str, raw_content: str = None, **kwargs):
         """Initialize JSON parsing error.
         
@@ -172,14 +195,14 @@ class JSONParsingError(ImageTaggerError):
         """
         super().__init__(message, **kwargs)
         self.raw_content = raw_content
-        if not self.details:
-            self.details = {}
         # Only include first 500 chars of raw content to avoid huge error messages
         self.details['raw_content_preview'] = raw_content[:500] if raw_content else None
 
 class ProcessingTimeoutError(ImageTaggerError):
     """Raised when processing times out."""
     
+    __slots__ = ('timeout_seconds',)
+    
     def __init__(self, message: str, timeout_seconds: int = None, **kwargs):
         """Initialize timeout error.
         
@@ -190,13 +213,13 @@ class ProcessingTimeoutError(ImageTaggerError):
         """
         super().__init__(message, **kwargs)
         self.timeout_seconds = timeout_seconds
-        if not self.details:
-            self.details = {}
         self.details['timeout_seconds'] = timeout_seconds
 
 class CircuitBreakerError(ImageTaggerError):
     """Raised when circuit breaker is open due to repeated failures."""
     
+    __slots__ = ('failure_count',)
+    
     def __init__(self, message: str, failure_count: int = None, **kwargs):
         """Initialize circuit breaker error.
         
@@ -207,6 +230,4 @@ class CircuitBreakerError(ImageTaggerError):
         """
         super().__init__(message, **kwargs)
         self.failure_count = failure_count
-        if not self.details:
-            self.details = {}
         self.details['failure_count'] = failure_count
\ No newline at end of file
@@ -1,4 +1,5 @@
 import io
+import itertools
 import json
 import logging
 import re
@@ -23,6 +24,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 import os
 
+from src.analysis_cache import AnalysisCache, make_cache_key
+
 # Configuration du logger enrichi - because plain text logs are so last century! 📜
 console = Console()
 logging.basicConfig(
@@ -32,6 +35,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger("image_processor")  # Our trusty sidekick for debugging adventures 🕵️‍♂️
 
+# Nombre maximal d'images par requête BatchAnnotateImages (limite Google)
+VISION_BATCH_SIZE = 16
+
+# Budget d'envoi aux APIs: 1024 px sur le plus grand côté, JPEG qualité 85.
+# Au-delà, le volume envoyé et la latence augmentent sans gain d'analyse notable.
+VISION_MAX_EDGE = 1024
+VISION_JPEG_QUALITY = 85
+
+# Taille maximale d'une image envoyée telle quelle (limite Vision API: 20 MB)
+VISION_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+# Fonctionnalités Vision demandées pour chaque image (fait partie de la clé de cache)
+VISION_FEATURES = (
+    vision_v1.Feature.Type.LABEL_DETECTION,
+    vision_v1.Feature.Type.WEB_DETECTION,
+    vision_v1.Feature.Type.IMAGE_PROPERTIES,
+    vision_v1.Feature.Type.OBJECT_LOCALIZATION,
+    vision_v1.Feature.Type.LANDMARK_DETECTION,
+)
+
+def prefetch_files(paths: List[str]) -> None:
+    """
+    Ask the kernel to start reading a whole batch of files ahead of time. 🚚
+    
+    Linux only (posix_fadvise WILLNEED): the reads are queued in the background
+    while we decode the first images. Silently does nothing elsewhere.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue  # Missing files are reported later by _prepare_image
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
 class ProcessingStats:
     """
     Classe pour suivre les statistiques de traitement - like a fitness tracker, 
@@ -96,7 +141,7 @@ class ImageProcessor:
     It's like having a digital art critic that never gets tired, never needs coffee,
     and always has something interesting to say about your photos! ☕
     """
-    def __init__(self, vision_client, gemini_model, lang="fr", verbose=1, max_workers=4):
+    def __init__(self, vision_client, gemini_model, lang="fr", verbose=1, max_workers=4, cache_dir=None):
         """Initialize our image processing wizard - assembly required! 🧙‍♂️"""
         self.vision_client = vision_client    # The eyes of the operation 👁️
         self.gemini_model = gemini_model      # The brain of the operation 🧠
@@ -107,6 +152,7 @@ class ImageProcessor:
         self._init_prompts()                  # Loading our conversation starters 💬
         self.retry_count = 3                 # Because third time's the charm! 🍀
         self.retry_delay = 2                 # Patience, young grasshopper ⏳
+        self.cache = AnalysisCache(cache_dir) if cache_dir else None  # Never pay twice for the same pixels 💸
         
         logger.info(f"🌍 Mode langue : [bold]{self.lang.upper()}[/bold]")
         logger.info(f"🧵 Traitement parallèle : [bold]{self.max_workers}[/bold] workers")
@@ -150,6 +196,24 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
             }
         }
         
+        # Everything below depends only on the language: resolve it once here
+        # instead of on every Gemini call 🎯
+        self.system_instruction = {
+            "fr": "Rédige toutes tes réponses en français. ",
+            "en": "Respond in English only. "
+        }[self.lang]
+        self.vision_context_prefixes = {
+            "fr": ("Voici des éléments détectés dans l'image: ", "Objets identifiés: ", "Lieux potentiels: "),
+            "en": ("Elements detected in the image: ", "Objects identified: ", "Potential landmarks: ")
+        }[self.lang]
+        self.main_prompt = self.prompts[self.lang]['main']
+        self.comment_prompt = f"{self.system_instruction}\n{self.prompts[self.lang]['comment_instruction']}"
+        self.generation_config = genai.types.GenerationConfig(
+            candidate_count=1,
+            temperature=0.7,
+            top_p=0.95
+        )
+        
     def _sanitize_filename(self, title: str) -> str:
         """
         Transform chaotic titles into well-behaved filenames! 🧹
@@ -195,23 +259,31 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
                 if self.verbose >= 2:
                     logger.info(f"📐 Dimensions originales : {original_size[0]}x{original_size[1]}")
                 
+                # JPEG: décodage directement à échelle réduite (1/2, 1/4, 1/8) quand c'est possible
+                if max(original_size) > VISION_MAX_EDGE:
+                    img.draft('RGB', (VISION_MAX_EDGE, VISION_MAX_EDGE))
+                
                 # Some images are special snowflakes with fancy color modes ❄️
-                if img.mode in ['P', 'RGBA']:
+                if img.mode not in ('RGB', 'L'):
                     if self.verbose >= 2:
                         logger.info(f"🎨 Conversion du mode {img.mode} vers RGB")
                     img = img.convert('RGB')
                 
                 # Vérifier si redimensionnement nécessaire
-                if max(original_size) > 1024:
-                    img.thumbnail((1024, 1024))
+                if max(img.size) > VISION_MAX_EDGE:
+                    img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.LANCZOS)
                     if self.verbose >= 2:
                         logger.info(f"📉 Image redimensionnée à {img.size[0]}x{img.size[1]}")
                 
                 buffer = io.BytesIO()
-                img.save(buffer, format="JPEG", quality=85)
+                img.save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY, optimize=True)
                 return buffer.getvalue(), original_size
         except Exception as e:
             logger.warning(f"⚠️ Redimensionnement échoué : {str(e)}")
+            # Envoi du fichier brut: inutile de le charger en mémoire si l'API le refusera
+            file_size = os.path.getsize(image_path)
+            if file_size > VISION_MAX_UPLOAD_BYTES:
+                raise ValueError(f"Fichier trop volumineux pour l'envoi brut: {file_size // (1024 * 1024)} MB")
             with open(image_path, "rb") as f:
                 return f.read(), (0, 0)  # Dimensions inconnues
 
@@ -313,144 +385,282 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
             logger.info(f"🔄 Traitement de {original_path.name}...")
         
         try:
-            # Vérification de l'existence du fichier
-            if not original_path.exists():
-                raise FileNotFoundError(f"Fichier non trouvé: {image_path}")
-            
-            # Vérification du type de fichier
-            if original_path.suffix.lower() not in ['.jpg', '.jpeg', '.png']:
-                raise ValueError(f"Format non supporté: {original_path.suffix}")
-            
             # Redimensionnement et préparation de l'image
-            image_bytes, original_dimensions = self.resize_image(str(original_path))
-            
-            mime_type = "image/jpeg"
-            if original_path.suffix.lower() == '.png':
-                mime_type = "image/png"
-            
-            # Analyse avec Vision API
-            if self.verbose >= 2:
-                logger.info("🔍 Analyse via Google Vision API...")
-            vision_data = self._analyze_with_vision(image_bytes)
+            image_bytes, original_dimensions = self._prepare_image(original_path)
             
-            # Analyse avec Gemini
-            if self.verbose >= 2:
-                logger.info("🤖 Génération de métadonnées via Gemini...")
-            gemini_data = self._analyze_with_gemini(image_bytes, mime_type, vision_data)
+            # Contenu déjà analysé: on évite les appels Vision et Gemini
+            gemini_data = self._get_cached_analysis(image_bytes)
+            if gemini_data is None:
+                # Analyse avec Vision API
+                if self.verbose >= 2:
+                    logger.info("🔍 Analyse via Google Vision API...")
+                vision_data = self._analyze_with_vision(image_bytes)
+                gemini_data = self._generate_metadata(original_path, image_bytes, vision_data)
             
-            # Renommage du fichier
-            if self.verbose >= 2:
-                logger.info("📝 Renommage du fichier...")
-            new_path = self._rename_file(original_path, gemini_data.get('title', ''))
+            return self._finalize_processing(original_path, original_dimensions, gemini_data, start_time)
+        except Exception as e:
+            return self._error_result(original_path, e, start_time)
+
+    def process_batch(self, image_paths: List[str]) -> List[Dict]:
+        """
+        Traite un lot d'images en regroupant les appels Vision API (BatchAnnotateImages).
+        
+        Les appels Gemini d'un lot partent en parallèle (max_workers) pendant que
+        le lot suivant est envoyé à Vision API: les deux latences se recouvrent.
+        """
+        results = []
+        futures = []
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for i in range(0, len(image_paths), VISION_BATCH_SIZE):
+                start_time = time.time()
+                errors, analyzed = self._analyze_vision_chunk(image_paths[i:i + VISION_BATCH_SIZE], start_time)
+                results.extend(errors)
+                for original_path, image_bytes, original_dimensions, gemini_data, vision_data in analyzed:
+                    futures.append(executor.submit(
+                        self._complete_processing, original_path, image_bytes,
+                        original_dimensions, gemini_data, vision_data, start_time
+                    ))
             
-            # Écriture des métadonnées
+            results.extend(future.result() for future in futures)
+        return results
+
+    def _analyze_vision_chunk(self, image_paths: List[str], start_time: float) -> Tuple[List[Dict], List[Tuple]]:
+        """
+        Prépare au plus VISION_BATCH_SIZE images et les analyse avec une seule requête Vision API.
+        
+        Returns:
+            (résultats d'échec, liste de (chemin, octets, dimensions, données en cache ou None, données Vision ou None))
+        """
+        errors = []
+        prepared = []
+        
+        # Lecture disque du lot lancée d'un coup, en arrière-plan
+        prefetch_files(image_paths)
+        
+        for image_path in image_paths:
+            original_path = pathlib.Path(image_path)
+            try:
+                image_bytes, original_dimensions = self._prepare_image(original_path)
+                cached = self._get_cached_analysis(image_bytes)
+                prepared.append((original_path, image_bytes, original_dimensions, cached))
+            except Exception as e:
+                errors.append(self._error_result(original_path, e, start_time))
+        
+        # Seules les images absentes du cache partent vers Vision API
+        to_analyze = [image_bytes for _, image_bytes, _, cached in prepared if cached is None]
+        vision_results = iter([])
+        if to_analyze:
             if self.verbose >= 2:
-                logger.info("📋 Écriture des métadonnées...")
-            metadata_status = self._write_metadata(new_path, gemini_data)
-            
-            processing_time = time.time() - start_time
-            
-            # Résumé des métadonnées générées
-            if self.verbose >= 1:
-                if "error" not in gemini_data:
-                    keywords_str = ", ".join(gemini_data.get('keywords', [])[:5])
-                    if len(gemini_data.get('keywords', [])) > 5:
-                        keywords_str += "..."
-                    
-                    logger.info(f"📊 Métadonnées générées : ")
-                    logger.info(f"  📌 Titre: {gemini_data.get('title', 'N/A')}")
-                    logger.info(f"  🏷️ Genre: {gemini_data.get('main_genre', 'N/A')}")
-                    logger.info(f"  🔑 Mots-clés: {keywords_str}")
-            
-            return {
-                "original_file": original_path.name,
-                "new_file": pathlib.Path(new_path).name,
-                "path": str(new_path),
-                "original_dimensions": original_dimensions,
-                **gemini_data,
-                "metadata_written": metadata_status,
-                "processing_time": processing_time
-            }
+                logger.info(f"🔍 Analyse groupée de {len(to_analyze)} images via Google Vision API...")
+            vision_results = iter(self._analyze_batch_with_vision(to_analyze))
+        
+        analyzed = [
+            (original_path, image_bytes, original_dimensions, cached,
+             next(vision_results) if cached is None else None)
+            for original_path, image_bytes, original_dimensions, cached in prepared
+        ]
+        return errors, analyzed
+
+    def _complete_processing(self, original_path: pathlib.Path, image_bytes: bytes, original_dimensions: Tuple[int, int],
+                             gemini_data: Optional[Dict], vision_data: Optional[Dict], start_time: float) -> Dict:
+        """Termine le traitement d'une image déjà passée par Vision API (ou trouvée en cache)"""
+        try:
+            if gemini_data is None:
+                gemini_data = self._generate_metadata(original_path, image_bytes, vision_data)
+            return self._finalize_processing(original_path, original_dimensions, gemini_data, start_time)
         except Exception as e:
-            error_message = str(e)
-            logger.error(f"❌ Échec du traitement : {error_message}")
-            return {
-                "original_file": original_path.name if original_path else "Unknown",
-                "error": error_message,
-                "processing_time": time.time() - start_time
-            }
+            return self._error_result(original_path, e, start_time)
+
+    def _prepare_image(self, original_path: pathlib.Path) -> Tuple[bytes, Tuple[int, int]]:
+        """Vérifie le fichier puis le redimensionne pour l'envoi aux APIs"""
+        # Vérification de l'existence du fichier
+        if not original_path.exists():
+            raise FileNotFoundError(f"Fichier non trouvé: {original_path}")
+        
+        # Vérification du type de fichier
+        if original_path.suffix.lower() not in ['.jpg', '.jpeg', '.png']:
+            raise ValueError(f"Format non supporté: {original_path.suffix}")
+        
+        return self.resize_image(str(original_path))
+
+    def _analysis_cache_key(self, image_bytes: bytes) -> str:
+        """Clé de cache: contenu envoyé + fonctionnalités Vision + langue + modèle Gemini"""
+        feature_names = ",".join(feature.name for feature in VISION_FEATURES)
+        model_name = getattr(self.gemini_model, "model_name", "")
+        return make_cache_key(image_bytes, feature_names, self.lang, model_name)
+
+    def _get_cached_analysis(self, image_bytes: bytes) -> Optional[Dict]:
+        """Retourne les métadonnées déjà générées pour ce contenu, s'il y en a"""
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self._analysis_cache_key(image_bytes))
+        if cached is not None and self.verbose >= 2:
+            logger.info("♻️ Analyse trouvée dans le cache, appels API ignorés")
+        return cached
+
+    def _generate_metadata(self, original_path: pathlib.Path, image_bytes: bytes, vision_data: Dict) -> Dict:
+        """Génère les métadonnées via Gemini et les met en cache en cas de succès"""
+        mime_type = "image/jpeg"
+        if original_path.suffix.lower() == '.png':
+            mime_type = "image/png"
+        
+        # Analyse avec Gemini
+        if self.verbose >= 2:
+            logger.info("🤖 Génération de métadonnées via Gemini...")
+        gemini_data = self._analyze_with_gemini(image_bytes, mime_type, vision_data)
+        
+        # Les valeurs par défaut d'un échec Gemini, ou un résultat généré sans le contexte
+        # Vision (échec Vision), ne doivent pas être réutilisés : le prochain passage réessaiera
+        if self.cache is not None and "error_gemini" not in gemini_data and "error_vision" not in vision_data:
+            self.cache.set(self._analysis_cache_key(image_bytes), gemini_data)
+        return gemini_data
+
+    def _finalize_processing(self, original_path: pathlib.Path, original_dimensions: Tuple[int, int],
+                             gemini_data: Dict, start_time: float) -> Dict:
+        """Renomme le fichier et écrit les métadonnées générées"""
+        # Renommage du fichier
+        if self.verbose >= 2:
+            logger.info("📝 Renommage du fichier...")
+        new_path = self._rename_file(original_path, gemini_data.get('title', ''))
+        
+        # Écriture des métadonnées
+        if self.verbose >= 2:
+            logger.info("📋 Écriture des métadonnées...")
+        metadata_status = self._write_metadata(new_path, gemini_data)
+        
+        processing_time = time.time() - start_time
+        
+        # Résumé des métadonnées générées
+        if self.verbose >= 1:
+            if "error" not in gemini_data:
+                keywords_str = ", ".join(gemini_data.get('keywords', [])[:5])
+                if len(gemini_data.get('keywords', [])) > 5:
+                    keywords_str += "..."
+                
+                logger.info(f"📊 Métadonnées générées : ")
+                logger.info(f"  📌 Titre: {gemini_data.get('title', 'N/A')}")
+                logger.info(f"  🏷️ Genre: {gemini_data.get('main_genre', 'N/A')}")
+                logger.info(f"  🔑 Mots-clés: {keywords_str}")
+        
+        return {
+            "original_file": original_path.name,
+            "new_file": pathlib.Path(new_path).name,
+            "path": str(new_path),
+            "original_dimensions": original_dimensions,
+            **gemini_data,
+            "metadata_written": metadata_status,
+            "processing_time": processing_time
+        }
+
+    @staticmethod
+    def _error_result(original_path: pathlib.Path, error: Exception, start_time: float) -> Dict:
+        """Construit le résultat d'échec d'une image"""
+        error_message = str(error)
+        logger.error(f"❌ Échec du traitement : {error_message}")
+        return {
+            "original_file": original_path.name if original_path else "Unknown",
+            "error": error_message,
+            "processing_time": time.time() - start_time
+        }
+
+    def _build_vision_request(self, image_bytes: bytes) -> Dict:
+        """Construit la requête Vision API (image, contexte linguistique, fonctionnalités)"""
+        return {
+            "image": vision_v1.Image(content=image_bytes),
+            "image_context": vision_v1.ImageContext(
+                language_hints=["fr" if self.lang == "fr" else "en"]
+            ),
+            "features": [{"type_": feature} for feature in VISION_FEATURES]
+        }
+
+    def _parse_vision_response(self, response) -> Dict:
+        """Extrait les données utiles d'une réponse AnnotateImage"""
+        result = {
+            "labels": [{"description": label.description, "score": label.score} 
+                      for label in response.label_annotations],
+            "web_entities": [{"description": entity.description, "score": entity.score} 
+                            for entity in response.web_detection.web_entities],
+            "colors": [{"rgb": f"rgb({int(color.color.red)},{int(color.color.green)},{int(color.color.blue)})", 
+                       "score": color.score} 
+                      for color in response.image_properties_annotation.dominant_colors.colors[:5]],
+            "objects": [{"name": obj.name, "confidence": obj.score} 
+                       for obj in response.localized_object_annotations],
+            "landmarks": [{"name": landmark.description, "confidence": landmark.score} 
+                         for landmark in response.landmark_annotations]
+        }
+        
+        if self.verbose >= 3:
+            detected_items = sum(len(v) for v in result.values())
+            logger.debug(f"Vision API: {detected_items} éléments détectés")
+        
+        return result
+
+    @staticmethod
+    def _empty_vision_result(error: str) -> Dict:
+        """Résultat Vision vide utilisé en cas d'échec (marqué par "error_vision")"""
+        return {
+            "labels": [],
+            "web_entities": [],
+            "colors": [],
+            "objects": [],
+            "landmarks": [],
+            "error_vision": error
+        }
 
     def _analyze_with_vision(self, image_bytes: bytes) -> Dict:
         """Analyse avec Vision API avec tentatives en cas d'échec"""
         for attempt in range(self.retry_count):
             try:
-                image = vision_v1.Image(content=image_bytes)
-                context = vision_v1.ImageContext(
-                    language_hints=["fr" if self.lang == "fr" else "en"]
-                )
-                
-                features = [
-                    {"type_": vision_v1.Feature.Type.LABEL_DETECTION},
-                    {"type_": vision_v1.Feature.Type.WEB_DETECTION},
-                    {"type_": vision_v1.Feature.Type.IMAGE_PROPERTIES},
-                    {"type_": vision_v1.Feature.Type.OBJECT_LOCALIZATION},
-                    {"type_": vision_v1.Feature.Type.LANDMARK_DETECTION}
-                ]
-                
                 if self.verbose >= 3:
                     logger.debug(f"Vision API: Tentative {attempt+1}/{self.retry_count}")
                 
-                response = self.vision_client.annotate_image({
-                    "image": image,
-                    "image_context": context,
-                    "features": features
-                })
+                response = self.vision_client.annotate_image(self._build_vision_request(image_bytes))
                 
                 # Extraction des données avec plus d'informations
-                result = {
-                    "labels": [{"description": label.description, "score": label.score} 
-                              for label in response.label_annotations],
-                    "web_entities": [{"description": entity.description, "score": entity.score} 
-                                    for entity in response.web_detection.web_entities],
-                    "colors": [{"rgb": f"rgb({int(color.color.red)},{int(color.color.green)},{int(color.color.blue)})", 
-                               "score": color.score} 
-                              for color in response.image_properties_annotation.dominant_colors.colors[:5]],
-                    "objects": [{"name": obj.name, "confidence": obj.score} 
-                               for obj in response.localized_object_annotations],
-                    "landmarks": [{"name": landmark.description, "confidence": landmark.score} 
-                                 for landmark in response.landmark_annotations]
-                }
+                return self._parse_vision_response(response)
                 
+            except Exception as e:
+                if attempt < self.retry_count - 1:
+                    logger.warning(f"⚠️ Vision API: échec tentative {attempt+1}: {str(e)}. Nouvelle tentative...")
+                    time.sleep(self.retry_delay * (attempt + 1))  # Backoff exponentiel
+                else:
+                    logger.error(f"❌ Vision API: échec après {self.retry_count} tentatives: {str(e)}")
+                    return self._empty_vision_result(str(e))
+
+    def _analyze_batch_with_vision(self, images_bytes: List[bytes]) -> List[Dict]:
+        """Analyse un lot d'images avec un seul appel BatchAnnotateImages"""
+        for attempt in range(self.retry_count):
+            try:
                 if self.verbose >= 3:
-                    detected_items = sum(len(v) for v in result.values())
-                    logger.debug(f"Vision API: {detected_items} éléments détectés")
+                    logger.debug(f"Vision API (lot de {len(images_bytes)}): Tentative {attempt+1}/{self.retry_count}")
                 
-                return result
+                batch_response = self.vision_client.batch_annotate_images(
+                    requests=[self._build_vision_request(image_bytes) for image_bytes in images_bytes]
+                )
+                
+                results = []
+                for response in batch_response.responses:
+                    # Une erreur sur une image n'invalide pas le reste du lot
+                    if response.error.message:
+                        logger.warning(f"⚠️ Vision API: erreur sur une image du lot: {response.error.message}")
+                        results.append(self._empty_vision_result(response.error.message))
+                    else:
+                        results.append(self._parse_vision_response(response))
+                return results
                 
             except Exception as e:
                 if attempt < self.retry_count - 1:
                     logger.warning(f"⚠️ Vision API: échec tentative {attempt+1}: {str(e)}. Nouvelle tentative...")
-                    time.sleep(self.retry_delay * (attempt + 1))  # Backoff exponentiel
+                    time.sleep(self.retry_delay * (attempt + 1))
                 else:
                     logger.error(f"❌ Vision API: échec après {self.retry_count} tentatives: {str(e)}")
-                    return {
-                        "labels": [],
-                        "web_entities": [],
-                        "colors": [],
-                        "objects": [],
-                        "landmarks": []
-                    }
+                    return [self._empty_vision_result(str(e)) for _ in images_bytes]
 
     def _analyze_with_gemini(self, image_bytes: bytes, mime_type: str, vision_data: Dict) -> Dict:
         """Appel Gemini API avec contexte linguistique strict et gestion des erreurs améliorée"""
         for attempt in range(self.retry_count):
             try:
-                # Instruction système explicite
-                system_instruction = {
-                    "fr": "Rédige toutes tes réponses en français. ",
-                    "en": "Respond in English only. "
-                }[self.lang]
-                
                 # Enrichir le prompt avec les données de Vision
                 vision_context = ""
                 if vision_data:
@@ -459,20 +669,15 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
                     objects = [obj.get("name") for obj in vision_data.get("objects", [])][:5]
                     landmarks = [lm.get("name") for lm in vision_data.get("landmarks", [])][:3]
                     
-                    if self.lang == "fr":
-                        vision_context = f"Voici des éléments détectés dans l'image: {', '.join(labels)}. "
-                        if objects:
-                            vision_context += f"Objets identifiés: {', '.join(objects)}. "
-                        if landmarks:
-                            vision_context += f"Lieux potentiels: {', '.join(landmarks)}. "
-                    else:
-                        vision_context = f"Elements detected in the image: {', '.join(labels)}. "
-                        if objects:
-                            vision_context += f"Objects identified: {', '.join(objects)}. "
-                        if landmarks:
-                            vision_context += f"Potential landmarks: {', '.join(landmarks)}. "
+                    labels_prefix, objects_prefix, landmarks_prefix = self.vision_context_prefixes
+                    vision_context = f"{labels_prefix}{', '.join(labels)}. "
+                    if objects:
+                        vision_context += f"{objects_prefix}{', '.join(objects)}. "
+                    if landmarks:
+                        vision_context += f"{landmarks_prefix}{', '.join(landmarks)}. "
 
-                full_prompt = f"{system_instruction}\n{vision_context}\n{self.prompts[self.lang]['main']}"
+                # Instruction système explicite
+                full_prompt = f"{self.system_instruction}\n{vision_context}\n{self.main_prompt}"
                 
                 if self.verbose >= 3:
                     logger.debug(f"Gemini: Tentative {attempt+1}/{self.retry_count}")
@@ -482,11 +687,7 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
                         {"mime_type": mime_type, "data": image_bytes},
                         full_prompt
                     ],
-                    generation_config=genai.types.GenerationConfig(
-                        candidate_count=1,
-                        temperature=0.7,
-                        top_p=0.95
-                    )
+                    generation_config=self.generation_config
                 )
                 
                 data = self._parse_gemini_response(response.text)
@@ -503,10 +704,9 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
                     if self.verbose >= 2:
                         logger.info("🔍 Génération d'un commentaire complémentaire...")
                     
-                    comment_prompt = f"{system_instruction}\n{self.prompts[self.lang]['comment_instruction']}"
                     comment_response = self.gemini_model.generate_content([
                         {"mime_type": mime_type, "data": image_bytes},
-                        comment_prompt
+                        self.comment_prompt
                     ])
                     data["comment"] = comment_response.text
                 
@@ -557,10 +757,8 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
             data["technical_characteristics"] = [k.strip() for k in data["technical_characteristics"].split(",")]
         
         # Maintain backward compatibility: create combined keywords for legacy systems
-        combined_keywords = []
-        combined_keywords.extend(data.get("content_keywords", []))
-        combined_keywords.extend(data.get("technical_characteristics", []))
-        data["keywords"] = list(dict.fromkeys([k for k in combined_keywords if k]))  # Remove duplicates
+        combined_keywords = itertools.chain(data.get("content_keywords", []), data.get("technical_characteristics", []))
+        data["keywords"] = list(dict.fromkeys(k for k in combined_keywords if k))  # Remove duplicates, keep order
 
     @staticmethod
     def _parse_gemini_response(text: str) -> Dict:
@@ -674,7 +872,7 @@ For technical_characteristics: identify technical and stylistic aspects (artisti
                     keywords.extend(metadata.get('technical_characteristics', []))
                 
                 # Dédoublonnage des mots-clés
-                keywords = list(dict.fromkeys([k for k in keywords if k]))
+                keywords = list(dict.fromkeys(k for k in keywords if k))
                 
                 # Créer une description combinée
                 full_description = f"{metadata.get('description', '')}\n\n{metadata.get('comment', '')}".strip()
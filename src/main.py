@@ -15,6 +15,7 @@ from rich.table import Table
 from rich import print as rprint
 from src.config import initialize_apis, check_credentials, select_gemini_model
 from src.image_processor import ImageProcessor
+from src.analysis_cache import DEFAULT_CACHE_DIR
 
 # Setting up our fancy logger - because plain text is so last century! ✨
 console = Console()
@@ -255,6 +256,7 @@ def main():
     parser.add_argument("--retry", type=int, default=3, help="Nombre de tentatives pour les appels API")
     parser.add_argument("--backup", action="store_true", help="Créer des sauvegardes des fichiers originaux")
     parser.add_argument("--recursive", "-r", action="store_true", help="Rechercher récursivement les images dans les sous-répertoires")
+    parser.add_argument("--no-cache", action="store_true", help="Ne pas réutiliser les analyses en cache (.vision_cache)")
 
     args = parser.parse_args()
     
@@ -302,7 +304,8 @@ def main():
             gemini_model, 
             lang=args.lang,
             verbose=args.verbose,
-            max_workers=args.workers
+            max_workers=args.workers,
+            cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR
         )
         
         # Configuration des options supplémentaires